@@ -9,7 +9,7 @@ from typing import List, Dict
 from pathlib import Path
 from src.utils.banner import print_banner
 from src.core.engine import Engine
-from src.modules.dns_enumerator import DNSEnumerator
+from src.modules.dns_enumerator import DNSEnumerator, resolve_nameservers
 from src.modules.subdomain_enumerator import SubdomainEnumerator
 from src.modules.tech_fingerprinter import TechFingerprinter
 from src.modules.http_analyzer import HTTPAnalyzer
@@ -17,6 +17,87 @@ from src.modules.waf_detector import WAFDetector
 from src.utils.logger import Logger
 from src.utils.exceptions import ConfigurationError, NetworkError, ZoroToolkitError, RateLimitExceededError, TaskExecutionError
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # type: ignore
+except ImportError:
+    uvloop = None  # --> e.g. on Windows, fall back to the default asyncio loop
+
+def _report_dns(logger: Logger, dns_result: Dict) -> None:
+    if isinstance(dns_result, dict) and dns_result.get('records'):
+        records = dns_result['records']
+        dns_info = []
+        if records.get('a'):
+            hostname, aliases, ips = records['a']
+            dns_info.extend([
+                f"Hostname: {hostname}",
+                f"IP Addresses: {', '.join(ips)}"
+            ])
+            if aliases:
+                dns_info.append(f"Aliases: {', '.join(aliases)}")
+        if records.get('mx'):
+            dns_info.append(f"MX Records: {', '.join(records['mx'])}")
+        logger.info("DNS Records found:\n" + "\n".join(f"    - {line}" for line in dns_info))
+
+def _report_waf(logger: Logger, waf_result: Dict) -> None:
+    if isinstance(waf_result, dict):
+        if waf_result.get('waf_detected', False):
+            logger.success(f"Detected WAF: {', '.join(waf_result['detected_wafs'])}")
+            if waf_result.get('recommendations'):
+                logger.info("WAF Recommendations:\n" + "\n".join(f"    - {rec}" for rec in waf_result['recommendations']))
+        else:
+            logger.warning("No WAF detected")
+    else:
+        logger.error("Invalid response from WAF detector.")
+
+def _report_tech(logger: Logger, tech_result: Dict, domain: str) -> None:
+    if isinstance(tech_result, dict) and tech_result.get('technologies'):
+        tech_info = []
+        for category, techs in tech_result['technologies'].items():
+            if techs:
+                tech_info.append(f"{category.capitalize()}:")
+                tech_info.extend([f"    - {tech}" for tech in techs])
+
+        if tech_info:
+            logger.info("Detected technologies:\n" + "\n".join(tech_info))
+        else:
+            logger.info("No technologies detected.")
+    else:
+        logger.warning(f"No technologies found for domain: {domain}")
+
+def _report_headers(logger: Logger, headers_result: Dict) -> None:
+    if isinstance(headers_result, dict):
+        missing_headers = []
+        for header, value in headers_result.get('headers', {}).items():
+            if value == 'Not Set':
+                missing_headers.append(header)
+        if missing_headers:
+            logger.warning("Missing security headers:\n" + "\n".join(f"    - {header}" for header in missing_headers))
+        if headers_result.get('recommendations'):
+            logger.info("Security header recommendations:\n" + "\n".join(f"    - {rec}" for rec in headers_result['recommendations']))
+
+def _report_subdomains(logger: Logger, subdomains_result: Dict) -> None:
+    if isinstance(subdomains_result, dict):
+        active_subdomains = []
+        inactive_subdomains = []
+        for sub in subdomains_result.get('subdomains', []):
+            if sub.get('status') == 'active':
+                active_subdomains.append(f"    - {sub['subdomain']} (✓ active)")
+            else:
+                inactive_subdomains.append(f"    - {sub['subdomain']} (✗ inactive)")
+
+        if active_subdomains or inactive_subdomains:
+            logger.info("Discovered subdomains:")
+            for sub in active_subdomains + inactive_subdomains:
+                logger.info(sub)
+
+async def _tagged(name: str, coro):
+    return name, await coro
+
 async def analyze_target(domain: str, options: Dict) -> List[Dict]:
     
     # --> Analyze target domain with all available modules.
@@ -24,110 +105,70 @@ async def analyze_target(domain: str, options: Dict) -> List[Dict]:
     logger.info(f"Starting comprehensive scan for domain: {domain}")
     
     try:
-        engine = Engine(
+        # --> The engine owns the shared HTTP session and closes it when the scan ends
+        async with Engine(
             thread_count=options.get('threads', 10),
-            timeout=options.get('timeout', 30)
-        )
-        
-        # --> Initialize modules
-        dns_enum = DNSEnumerator()
-        waf_detector = WAFDetector()
-        subdomain_enum = SubdomainEnumerator(domain)
-        http_analyzer = HTTPAnalyzer()
-        tech_fingerprinter = TechFingerprinter()
-        
-        # --> DNS Information
-        logger.info("Gathering DNS information...")
-        dns_result = await engine.execute_async(dns_enum.get_dns_info, domain)
-        if isinstance(dns_result, dict) and dns_result.get('records'):
-            records = dns_result['records']
-            dns_info = []
-            if records.get('a'):
-                hostname, aliases, ips = records['a']
-                dns_info.extend([
-                    f"Hostname: {hostname}",
-                    f"IP Addresses: {', '.join(ips)}"
-                ])
-                if aliases:
-                    dns_info.append(f"Aliases: {', '.join(aliases)}")
-            if records.get('mx'):
-                dns_info.append(f"MX Records: {', '.join(records['mx'])}")
-            logger.info("DNS Records found:\n" + "\n".join(f"    - {line}" for line in dns_info))
+            timeout=options.get('timeout', 30),
+            nameservers=options.get('resolvers')
+        ) as engine:
+            # --> Initialize modules
+            dns_enum = DNSEnumerator(engine.dns_cache, nameservers=options.get('resolvers'))
+            waf_detector = WAFDetector(engine.session)
+            subdomain_enum = SubdomainEnumerator(domain, engine.session, dns_cache=engine.dns_cache)
+            http_analyzer = HTTPAnalyzer(engine.session)
+            tech_fingerprinter = TechFingerprinter(engine.session)
+            url = f"https://{domain}"
         
-        # --> WAF Detection
-        logger.info("Detecting WAF presence...")
-        waf_result = await engine.execute_async(waf_detector.detect_waf, f"https://{domain}")
-        if isinstance(waf_result, dict):
-            if waf_result.get('waf_detected', False):
-                logger.success(f"Detected WAF: {', '.join(waf_result['detected_wafs'])}")
-                if waf_result.get('recommendations'):
-                    logger.info("WAF Recommendations:\n" + "\n".join(f"    - {rec}" for rec in waf_result['recommendations']))
-            else:
-                logger.warning("No WAF detected")
-        else:
-            logger.error("Invalid response from WAF detector.")
-
+            logger.info("Gathering DNS information, detecting WAF, fingerprinting technologies, "
+                        "analyzing security headers and enumerating subdomains...")
+            reporters = {
+                'dns_info': _report_dns,
+                'waf_info': _report_waf,
+                'tech_info': lambda logger, result: _report_tech(logger, result, domain),
+                'security_headers': _report_headers,
+                'subdomains': _report_subdomains
+            }
         
-        # --> Technology Fingerprinting
-        logger.info("Fingerprinting web technologies...")
-        tech_result = await tech_fingerprinter.fingerprint(f"https://{domain}")
-        if isinstance(tech_result, dict) and tech_result.get('technologies'):
-            tech_info = []
-            for category, techs in tech_result['technologies'].items():
-                if techs:
-                    tech_info.append(f"{category.capitalize()}:")
-                    tech_info.extend([f"    - {tech}" for tech in techs])
-    
-            if tech_info:
-                logger.info("Detected technologies:\n" + "\n".join(tech_info))
-            else:
-                logger.info("No technologies detected.")
-        else:
-            logger.warning(f"No technologies found for domain: {domain}")
-
-        # --> Security Headers
-        logger.info("Analyzing security headers...")
-        headers_result = await engine.execute_async(http_analyzer.analyze_headers, f"https://{domain}")
-        if isinstance(headers_result, dict):
-            missing_headers = []
-            for header, value in headers_result.get('headers', {}).items():
-                if value == 'Not Set':
-                    missing_headers.append(header)
-            if missing_headers:
-                logger.warning("Missing security headers:\n" + "\n".join(f"    - {header}" for header in missing_headers))
-            if headers_result.get('recommendations'):
-                logger.info("Security header recommendations:\n" + "\n".join(f"    - {rec}" for rec in headers_result['recommendations']))
+            # --> The engine bounds global and per-host fan-out for every stage. Stages that only
+            # --> need the name start right away; the HTTP probes wait for the target's address.
+            results = {}
+            tasks = [
+                asyncio.ensure_future(_tagged('dns_info', engine.execute_async(dns_enum.get_dns_info, domain))),
+                asyncio.ensure_future(_tagged('subdomains', engine.execute_async(
+                    subdomain_enum.enumerate, timeout=None  # --> External tools can run long
+                )))
+            ]
+            try:
+                # --> Resolve the target once before the probes. They start together and would otherwise
+                # --> all miss the shared DNS cache and look the same name up in parallel.
+                try:
+                    await engine.dns_cache.resolve(domain)  # --> Warms the shared cache the probes resolve through
+                except OSError as e:
+                    logger.warning(f"Could not pre-resolve {domain}: {str(e)}")
         
-        # --> Subdomain Enumeration
-        logger.info("Enumerating subdomains...")
-        subdomains_result = await subdomain_enum.enumerate()
-        if isinstance(subdomains_result, dict):
-            active_subdomains = []
-            inactive_subdomains = []
-            for sub in subdomains_result.get('subdomains', []):
-                if sub.get('status') == 'active':
-                    active_subdomains.append(f"    - {sub['subdomain']} (✓ active)")
-                else:
-                    inactive_subdomains.append(f"    - {sub['subdomain']} (✗ inactive)")
-            
-            if active_subdomains or inactive_subdomains:
-                logger.info("Discovered subdomains:")
-                for sub in active_subdomains + inactive_subdomains:
-                    logger.info(sub)
+                probes = {
+                    'waf_info': engine.execute_async(waf_detector.detect_waf, url),
+                    'tech_info': engine.execute_async(tech_fingerprinter.fingerprint, url),
+                    'security_headers': engine.execute_async(http_analyzer.analyze_headers, url)
+                }
+                tasks.extend(asyncio.ensure_future(_tagged(name, coro)) for name, coro in probes.items())
         
-        # --> Process results
-        results = {
-            'dns_info': [dns_result] if dns_result else [],
-            'waf_info': [waf_result] if waf_result else [],
-            'tech_info': [tech_result] if tech_result else [],
-            'security_headers': [headers_result] if headers_result else [],
-            'subdomains': subdomains_result if subdomains_result else []
-        }
+                # --> Report each stage as soon as it lands instead of waiting for the slowest one
+                for next_stage in asyncio.as_completed(tasks):
+                    name, result = await next_stage
+                    results[name] = result
+                    reporters[name](logger, result)
+            finally:
+                # --> Never leave a stage running against the session the engine is about to close
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
         
-        return results
+            return results
         
     except ZoroToolkitError as e:
         logger.error(f"Scan failed: {str(e)}")
+        e.log_error()  # --> Traceback and context are written here, where the error is handled
         return {'status': 'error', 'error': str(e)}
 
 def save_report(results: Dict, domain: str, output_dir: Path) -> Path:
@@ -145,8 +186,12 @@ def save_report(results: Dict, domain: str, output_dir: Path) -> Path:
         'results': results
     }
     
-    with open(report_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    # --> orjson serializes the whole report in one pass and one write
+    if orjson is not None:
+        report_file.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
+    else:
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
     
     return report_file
 
@@ -157,6 +202,7 @@ def main():
     parser.add_argument("domain", help="Target domain to scan")
     parser.add_argument("--threads", type=int, default=10, help="Number of threads")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout in seconds")
+    parser.add_argument("--resolvers", type=str, help="Comma-separated DNS servers to query (default: system resolvers)")
     parser.add_argument("--output-dir", type=str, default="reports", help="Output directory for reports")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
     args = parser.parse_args()
@@ -166,17 +212,32 @@ def main():
     output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True)
     
+    logger = Logger()
+    
+    # --> Resolver names are turned into addresses once, both the DNS enumerator and the
+    # --> engine's c-ares channels only accept IPs
+    try:
+        resolvers = resolve_nameservers(args.resolvers.split(',')) if args.resolvers else None
+    except OSError as e:
+        logger.critical(f"Could not resolve nameserver: {str(e)}")
+        sys.exit(1)
+    
     options = {
         'threads': args.threads,
         'timeout': args.timeout,
-        'verbose': args.verbose
+        'verbose': args.verbose,
+        'resolvers': resolvers
     }
     
-    logger = Logger()
-    
     try:
         logger.info(f"Starting scan for {args.domain}")
-        results = asyncio.run(analyze_target(args.domain, options))
+        if uvloop is not None and hasattr(uvloop, 'run'):
+            results = uvloop.run(analyze_target(args.domain, options))
+        elif uvloop is not None:
+            uvloop.install()  # --> uvloop < 0.18 has no run(), install its loop policy instead
+            results = asyncio.run(analyze_target(args.domain, options))
+        else:
+            results = asyncio.run(analyze_target(args.domain, options))
         
         # --> Save report
         report_file = save_report(results, args.domain, output_dir)
@@ -188,6 +249,7 @@ def main():
         sys.exit(1)
     except ZoroToolkitError as e:
         logger.critical(f"ZoroToolkitError occurred: {e.message}")
+        e.log_error()
         sys.exit(1)
     except TaskExecutionError as e:
         logger.critical(f"TaskExecutionError occurred: {e.message}")
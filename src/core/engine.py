@@ -1,68 +1,155 @@
 # src/core/engine.py 
 import asyncio
+import functools
+import itertools
+import math
+import random
+import socket
 import threading
-from queue import PriorityQueue, Empty
+import time
+from collections import deque
+from queue import PriorityQueue
 from typing import List, Callable, Any, Dict, Optional, Union
 from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import aiohttp  # type: ignore
 from ..utils.logger import Logger
 from ..utils.rate_limit import RateLimiter
-from ..utils.exceptions import TaskExecutionError
+from ..utils.dns_cache import TTLDNSCache, CachingResolver
+from ..utils.exceptions import TaskExecutionError, RateLimitExceededError, NetworkError
 
 class Engine:
     """
     Advanced task execution engine with support for both threaded and async execution.
     """
-    def __init__(self, thread_count: int = 10, timeout: int = 30):
+    # --> Failures worth retrying, anything else is recorded immediately. Timeouts are left out,
+    # --> a retry would spend the whole timeout again.
+    RETRYABLE_ERRORS = (RateLimitExceededError, NetworkError, ConnectionError)
+
+    def __init__(self, thread_count: int = 10, timeout: int = 30, per_host_limit: int = 64,
+                 nameservers: Optional[List[str]] = None):
         self.thread_count = thread_count
         self.timeout = timeout
+        self.per_host_limit = per_host_limit
         self.queue: PriorityQueue = PriorityQueue()  # --> Using PriorityQueue instead of Queue
-        self.results: List[Dict] = []
+        self._sequence = itertools.count()  # --> Tie-breaker so equal priorities never compare callables
+        self.results: deque = deque()  # --> deque.append is atomic, workers need no lock to record results
         self.logger = Logger()
         self.rate_limiter = RateLimiter()
-        self._lock = threading.Lock()
-        self._executor = ThreadPoolExecutor(max_workers=thread_count)
-        self._stop_event = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None  # --> Built on the first blocking task
+        self._global_sem = asyncio.Semaphore(thread_count)
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.dns_cache = TTLDNSCache(nameservers=nameservers)
 
-    async def execute_async(self, task: Callable, *args, **kwargs) -> Optional[Dict]:
-        """Execute a task asynchronously with timeout and error handling."""
-        try:
-            loop = asyncio.get_event_loop()
-            task_timeout = kwargs.pop('timeout', self.timeout)  # --> Custom task timeout
-
-            result = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self._executor,
-                    lambda: task(*args, **kwargs)
-                ),
-                timeout=task_timeout
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session for the async modules, created on first use inside the running loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=1024,
+                    limit_per_host=64,
+                    resolver=CachingResolver(self.dns_cache),
+                    family=socket.AF_INET,  # --> The cache only holds A records
+                    keepalive_timeout=75,  # --> Keep idle connections long enough to span scan stages
+                    enable_cleanup_closed=True,
+                    use_dns_cache=False  # --> Lookups are cached by the shared TTLDNSCache
+                )
+            )
+        return self._session
+
+    async def initialize(self) -> None:
+        """Open the shared HTTP session so every module reuses its connections and TLS state."""
+        self.session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Exponential backoff with jitter so retrying workers don't hit the target in lockstep."""
+        return min(60, (2 ** attempt) + random.uniform(0, 1))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool for blocking tasks, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.thread_count)
+        return self._executor
+
+    def _get_host_sem(self, host: str) -> asyncio.Semaphore:
+        """Return the semaphore capping in-flight requests to a single host."""
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(self.per_host_limit)
+        return sem
+
+    @staticmethod
+    def _host_of(args: tuple) -> str:
+        """Best-effort target host from a task's first positional argument (URL or bare domain)."""
+        if args and isinstance(args[0], str):
+            target = args[0]
+            return (urlparse(target).hostname or target) if '://' in target else target
+        return ''
+
+    async def _dispatch(self, task: Callable, args: tuple, kwargs: dict, task_timeout: Optional[float]) -> Any:
+        # --> Native coroutines run straight on the loop, only blocking callables need a thread
+        if asyncio.iscoroutinefunction(task):
+            pending = task(*args, **kwargs)
+        else:
+            pending = asyncio.get_running_loop().run_in_executor(
+                self._get_executor(),
+                functools.partial(task, *args, **kwargs)
             )
-            return result
-        except asyncio.TimeoutError:
-            error_msg = f"Task timed out after {task_timeout} seconds"
-            self.logger.error(error_msg)
-            return {"status": "timeout", "error": error_msg}
-        except Exception as e:
-            error_msg = f"Task execution failed: {str(e)}"
-            self.logger.error(error_msg)
-            return {"status": "error", "error": str(e)}
+        return await asyncio.wait_for(pending, timeout=task_timeout)
+
+    async def execute_async(self, task: Callable, *args, **kwargs) -> Optional[Dict]:
+        """Execute a task asynchronously with concurrency limits, timeout, retries and error handling."""
+        task_timeout = kwargs.pop('timeout', self.timeout)  # --> Custom task timeout
+        max_retries = kwargs.pop('max_retries', 0)
+        host_sem = self._get_host_sem(self._host_of(args))
+
+        attempt = 0
+        while True:
+            try:
+                async with self._global_sem, host_sem:
+                    return await self._dispatch(task, args, kwargs, task_timeout)
+            except Exception as e:
+                if isinstance(e, self.RETRYABLE_ERRORS) and attempt < max_retries:
+                    attempt += 1
+                    self.logger.warning(f"Task failed, retrying... (Attempt {attempt}/{max_retries})")
+                    await asyncio.sleep(self._backoff_delay(attempt))  # --> Back off outside the semaphores
+                    continue
+                if isinstance(e, asyncio.TimeoutError):
+                    error_msg = f"Task timed out after {task_timeout} seconds"
+                    self.logger.error(error_msg)
+                    return {"status": "timeout", "error": error_msg}
+                error_msg = f"Task execution failed: {str(e)}"
+                self.logger.error(error_msg)
+                return {"status": "error", "error": str(e)}
 
     def add_task(self, task: Callable, *args, **kwargs) -> None:
         """Add a task to the execution queue with priority support."""
         priority = kwargs.pop('priority', 0)
         max_retries = kwargs.pop('max_retries', 3)
         timeout = kwargs.pop('timeout', self.timeout)
-        self.queue.put((priority, task, args, kwargs, max_retries, timeout))
+        self.queue.put((priority, next(self._sequence), task, args, kwargs, max_retries, timeout))
+
+    def _put_stop(self) -> None:
+        """Queue a poison pill that sorts after every real task."""
+        self.queue.put((math.inf, next(self._sequence), None, (), {}, 0, 0))
 
     def worker(self) -> None:
         """Enhanced worker with priority handling and graceful shutdown."""
-        while not self._stop_event.is_set():
+        while True:
+            priority, _, task, args, kwargs, max_retries, timeout = self.queue.get()
             try:
-                priority, task, args, kwargs, max_retries, timeout = self.queue.get_nowait()
-                with self._lock:
-                    self.rate_limiter.wait()
-                    self._execute_task(priority, task, args, kwargs, max_retries, timeout)
-            except Empty:
-                break
+                if task is None:  # --> Poison pill pushed by run() once the queue has drained
+                    break
+                self.rate_limiter.wait()
+                self._execute_task(priority, task, args, kwargs, max_retries, timeout)
             except Exception as e:
                 self.logger.error(f"Worker encountered an error: {str(e)}")
             finally:
@@ -71,50 +158,65 @@ class Engine:
     def _execute_task(self, priority: int, task: Callable, args: tuple, kwargs: dict, max_retries: int, timeout: int) -> None:
         """Execute task and store result, with retry logic."""
         retries = 0
-        while retries <= max_retries:
+        while True:
             try:
                 result = task(*args, **kwargs)
-                if result:
-                    self.results.append({
-                        "priority": priority,
-                        "status": "success",
-                        "result": result
-                    })
-                break
             except Exception as e:
-                retries += 1
-                if retries > max_retries:
-                    self.logger.error(f"Task failed after {retries} retries: {str(e)}")
-                    self.results.append({
-                        "priority": priority,
-                        "status": "error",
-                        "error": str(e)
-                    })
-                else:
-                    self.logger.warning(f"Task failed, retrying... (Attempt {retries}/{max_retries})")
-                if retries <= max_retries:
+                if isinstance(e, self.RETRYABLE_ERRORS) and retries < max_retries:
+                    retries += 1
+                    delay = self._backoff_delay(retries)
+                    self.logger.warning(f"Task failed, retrying in {delay:.1f}s... (Attempt {retries}/{max_retries})")
+                    time.sleep(delay)
                     continue
+                self.logger.error(f"Task failed after {retries} retries: {str(e)}")
+                self.results.append({
+                    "priority": priority,
+                    "status": "error",
+                    "error": str(e)
+                })
+                return
+            # --> Outside the try, only exceptions from the task itself count as task failures
+            if result:
+                self.results.append({
+                    "priority": priority,
+                    "status": "success",
+                    "result": result
+                })
+            return
 
-    async def run_async(self) -> List[Dict]:
-        """Run tasks asynchronously with enhanced error handling."""
+    async def run_async(self, on_result: Optional[Callable[[Any], None]] = None) -> List[Dict]:
+        """
+        Run tasks asynchronously with enhanced error handling.
+        
+        Args:
+            on_result: Optional callback invoked with each result as soon as it completes
+        """
         tasks = []
         while not self.queue.empty():
-            priority, task, args, kwargs, max_retries, timeout = self.queue.get()
-            tasks.append(self.execute_async(task, *args, **kwargs, timeout=timeout))
+            priority, _, task, args, kwargs, max_retries, timeout = self.queue.get()
+            tasks.append(self.execute_async(task, *args, **kwargs, timeout=timeout, max_retries=max_retries))
             self.queue.task_done()
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        return [r for r in results if r is not None]
+        results = []
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            if result is None:
+                continue
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        return results
 
-    def run(self, async_mode: bool = False) -> List[Dict]:
+    def run(self, async_mode: bool = False, on_result: Optional[Callable[[Any], None]] = None) -> List[Dict]:
         """
         Run tasks with support for both synchronous and asynchronous execution.
         
         Args:
             async_mode: If True, runs tasks asynchronously
+            on_result: Callback for each async result as it completes (async mode only)
         """
         if async_mode:
-            return asyncio.run(self.run_async())
+            return asyncio.run(self.run_async(on_result))
 
         threads = []
         for _ in range(self.thread_count):
@@ -124,14 +226,25 @@ class Engine:
             threads.append(t)
 
         self.queue.join()
-        self._stop_event.set()
+        for _ in threads:
+            self._put_stop()
         for t in threads:
             t.join()
 
-        return self.results
+        return list(self.results)
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._executor.shutdown(wait=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
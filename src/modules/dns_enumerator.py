@@ -1,14 +1,40 @@
 # src/modules/dns_enumerator.py
+import asyncio
+import functools
+import ipaddress
 import socket
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import dns.asyncresolver # type: ignore
+import dns.exception # type: ignore
 import dns.resolver # type: ignore
 from ..utils.logger import Logger
+from ..utils.dns_cache import TTLDNSCache
+
+def _is_ip(value: str) -> bool:
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+@functools.lru_cache(maxsize=64)
+def _resolve_ns(name: str) -> str:
+    """Resolve a nameserver hostname once per process."""
+    return socket.gethostbyname(name)
+
+def resolve_nameservers(nameservers: List[str]) -> List[str]:
+    """Turn a nameserver list into addresses; IPs pass through and names are only looked up once."""
+    return [ns if _is_ip(ns) else _resolve_ns(ns) for ns in nameservers]
 
 class DNSEnumerator:
-    def __init__(self):
+    def __init__(self, dns_cache: Optional[TTLDNSCache] = None, nameservers: Optional[List[str]] = None):
         self.logger = Logger()
+        self.dns_cache = dns_cache or TTLDNSCache()
+        self.resolver = dns.asyncresolver.Resolver()  # --> Queries run on the event loop, not in a thread
+        if nameservers:
+            self.resolver.nameservers = resolve_nameservers(nameservers)  # --> dnspython needs addresses
 
-    def resolve_domain(self, domain: str) -> Dict:
+    async def resolve_domain(self, domain: str) -> Dict:
         """
         Resolves the given domain to its corresponding IP address.
 
@@ -16,13 +42,13 @@ class DNSEnumerator:
         :return: A dictionary containing the domain, IP, status, and error (if any).
         """
         try:
-            ip_address = socket.gethostbyname(domain)
+            addresses = await self.dns_cache.resolve(domain)
             return {
                 "domain": domain,
-                "ip": ip_address,
+                "ip": addresses[0],
                 "status": "success"
             }
-        except socket.gaierror as e:
+        except OSError as e:
             self.logger.error(f"DNS resolution failed for {domain}: {str(e)}")
             return {
                 "domain": domain,
@@ -31,7 +57,34 @@ class DNSEnumerator:
                 "error": str(e)
             }
 
-    def get_mx_records(self, domain: str) -> List[str]:
+    async def resolve_many(self, domains: List[str]) -> List[Dict]:
+        """
+        Resolves several domains concurrently.
+
+        :param domains: The domain names to resolve.
+        :return: One resolve_domain result per domain, in the same order.
+        """
+        return await asyncio.gather(*(self.resolve_domain(domain) for domain in domains))
+
+    async def get_a_records(self, domain: str) -> Tuple:
+        """
+        Retrieves the A records for the given domain.
+
+        :param domain: The domain name to query for A records.
+        :return: A (hostname, aliases, addresses) tuple, or an empty tuple on failure.
+        """
+        try:
+            answer = await self.resolver.resolve(domain, 'A')
+            ips = [record.address for record in answer]
+            hostname = str(answer.canonical_name).rstrip('.')
+            aliases = [domain] if hostname != domain else []
+            self.dns_cache.set(domain, ips)
+            return hostname, aliases, ips
+        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers, dns.exception.Timeout) as e:
+            self.logger.error(f"Failed to retrieve A records for {domain}: {str(e)}")
+            return ()
+
+    async def get_mx_records(self, domain: str) -> List[str]:
         """
         Retrieves the MX records for the given domain.
 
@@ -39,7 +92,7 @@ class DNSEnumerator:
         :return: A list of MX records.
         """
         try:
-            mx_records = dns.resolver.resolve(domain, 'MX')
+            mx_records = await self.resolver.resolve(domain, 'MX')
             return [str(record.exchange) for record in mx_records]
         except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers) as e:
             self.logger.warning(f"Failed to retrieve MX records for {domain}: {str(e)}")
@@ -48,7 +101,7 @@ class DNSEnumerator:
             self.logger.error(f"Unexpected error retrieving MX records for {domain}: {str(e)}")
             return []
 
-    def get_dns_info(self, domain: str) -> Dict:
+    async def get_dns_info(self, domain: str) -> Dict:
         """
         Retrieves DNS information for the given domain, including A and MX records.
 
@@ -56,22 +109,18 @@ class DNSEnumerator:
         :return: A dictionary containing the domain, DNS records, status, and error (if any).
         """
         try:
-            dns_records = {}
-
-            # A Record
-            try:
-                a_records = socket.gethostbyname_ex(domain)
-                dns_records["a"] = a_records
-            except socket.gaierror as e:
-                self.logger.error(f"Failed to retrieve A records for {domain}: {str(e)}")
-                dns_records["a"] = []
-
-            # MX Records
-            dns_records["mx"] = self.get_mx_records(domain)
+            # --> Query every record type at once, the total cost is the slowest lookup
+            a_records, mx_records = await asyncio.gather(
+                self.get_a_records(domain),
+                self.get_mx_records(domain)
+            )
 
             return {
                 "domain": domain,
-                "records": dns_records,
+                "records": {
+                    "a": a_records,
+                    "mx": mx_records
+                },
                 "status": "success"
             }
         except Exception as e:
@@ -81,4 +130,4 @@ class DNSEnumerator:
                 "records": {},
                 "status": "failed",
                 "error": str(e)
-            }
\ No newline at end of file
+            }
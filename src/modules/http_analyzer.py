@@ -1,19 +1,39 @@
 # src/modules/http_analyzer.py
+import asyncio
+import re
 import socket
 import ssl
-import urllib.request
-import urllib.error
-import urllib.parse
+import aiohttp  # type: ignore
 from typing import Dict, Optional, List
 from ..utils.logger import Logger
 
+# --> Security headers reported for every target, with the value used when absent
+SECURITY_HEADERS = (
+    ('X-Frame-Options', 'Not Set'),
+    ('X-XSS-Protection', 'Not Set'),
+    ('X-Content-Type-Options', 'Not Set'),
+    ('Strict-Transport-Security', 'Not Set'),
+    ('Content-Security-Policy', 'Not Set'),
+    ('Server', 'Not Disclosed')
+)
+
+# --> robots.txt matchers compiled once: every Disallow path in one sweep, then a single
+# --> alternation for the sensitive keywords instead of one substring test per keyword
+DISALLOW_RE = re.compile(r'^Disallow:[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+SENSITIVE_PATH_RE = re.compile(
+    '|'.join(re.escape(keyword) for keyword in ['admin', 'login', 'backup', 'wp-', 'config', 'test']),
+    re.IGNORECASE
+)
+
 class HTTPAnalyzer:
     """Analyzes HTTP/HTTPS endpoints for security information."""
     
-    def __init__(self):
+    def __init__(self, session: aiohttp.ClientSession):
         self.logger = Logger()
+        self.session = session
         self.timeout = 10
         self.user_agent = "Zoro-Toolkit/1.0"
+        self.ssl_context = self._create_ssl_context()  # --> Built once, loading the CA store is not free
 
     def _create_ssl_context(self) -> ssl.SSLContext:
         """Create a secure SSL context for HTTPS requests."""
@@ -22,24 +42,20 @@ class HTTPAnalyzer:
         context.verify_mode = ssl.CERT_REQUIRED
         return context
 
-    def analyze_headers(self, url: str) -> Dict:
+    async def analyze_headers(self, url: str) -> Dict:
         """Analyze HTTP response headers for security headers."""
         try:
-            req = urllib.request.Request(
+            async with self.session.get(
                 url,
-                headers={'User-Agent': self.user_agent}
-            )
-            context = self._create_ssl_context()
-            
-            with urllib.request.urlopen(req, context=context, timeout=self.timeout) as response:
-                headers = dict(response.headers)
+                headers={'User-Agent': self.user_agent},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                ssl=self.ssl_context
+            ) as response:
+                # --> Look the few headers we need up on aiohttp's case-insensitive multidict
+                # --> instead of copying every header into a plain, case-sensitive dict
+                headers = response.headers
                 security_headers = {
-                    'X-Frame-Options': headers.get('X-Frame-Options', 'Not Set'),
-                    'X-XSS-Protection': headers.get('X-XSS-Protection', 'Not Set'),
-                    'X-Content-Type-Options': headers.get('X-Content-Type-Options', 'Not Set'),
-                    'Strict-Transport-Security': headers.get('Strict-Transport-Security', 'Not Set'),
-                    'Content-Security-Policy': headers.get('Content-Security-Policy', 'Not Set'),
-                    'Server': headers.get('Server', 'Not Disclosed')
+                    name: headers.get(name, default) for name, default in SECURITY_HEADERS
                 }
                 
                 return {
@@ -78,65 +94,69 @@ class HTTPAnalyzer:
             
         return recommendations
 
-    def check_robots_sitemap(self, domain: str) -> Dict:
-        """Check robots.txt and sitemap.xml for sensitive information."""
-        results = {
-            'domain': domain,
-            'robots_txt': None,
-            'sitemap_xml': None,
-            'sensitive_paths': []
+    async def _check_robots(self, domain: str) -> Dict:
+        """Fetch robots.txt and collect the sensitive Disallow paths."""
+        robots_url = f"https://{domain}/robots.txt"
+        async with self.session.get(
+            robots_url,
+            headers={'User-Agent': self.user_agent},
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as response:
+            if response.status >= 400:
+                return {
+                    'robots_txt': {
+                        'status': 'not_found',
+                        'error': f"HTTP Error {response.status}: {response.reason}"
+                    },
+                    'sensitive_paths': []
+                }
+            robots_content = await response.text(encoding='utf-8')
+
+        # Look for sensitive paths
+        sensitive_paths = [
+            path for path in DISALLOW_RE.findall(robots_content) if SENSITIVE_PATH_RE.search(path)
+        ]
+
+        return {
+            'robots_txt': {
+                'status': 'found',
+                'content': robots_content
+            },
+            'sensitive_paths': sensitive_paths
         }
-        
-        try:
-            # Check robots.txt
-            robots_url = f"https://{domain}/robots.txt"
-            req = urllib.request.Request(
-                robots_url,
-                headers={'User-Agent': self.user_agent}
-            )
-            
-            try:
-                with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                    robots_content = response.read().decode('utf-8')
-                    results['robots_txt'] = {
-                        'status': 'found',
-                        'content': robots_content
-                    }
-                    
-                    # Look for sensitive paths
-                    for line in robots_content.split('\n'):
-                        if line.startswith('Disallow:'):
-                            path = line.split(':', 1)[1].strip()
-                            if any(sensitive in path.lower() for sensitive in 
-                                ['admin', 'login', 'backup', 'wp-', 'config', 'test']):
-                                results['sensitive_paths'].append(path)
-                                
-            except urllib.error.HTTPError as e:
-                results['robots_txt'] = {
+
+    async def _check_sitemap(self, domain: str) -> Dict:
+        """Check whether sitemap.xml is exposed."""
+        sitemap_url = f"https://{domain}/sitemap.xml"
+        async with self.session.get(
+            sitemap_url,
+            headers={'User-Agent': self.user_agent},
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as response:
+            if response.status >= 400:
+                return {
                     'status': 'not_found',
-                    'error': str(e)
+                    'error': f"HTTP Error {response.status}: {response.reason}"
                 }
-                
-            # Check sitemap.xml
-            sitemap_url = f"https://{domain}/sitemap.xml"
-            req = urllib.request.Request(
-                sitemap_url,
-                headers={'User-Agent': self.user_agent}
+            return {
+                'status': 'found',
+                'content_type': response.headers.get('Content-Type', 'unknown')
+            }
+
+    async def check_robots_sitemap(self, domain: str) -> Dict:
+        """Check robots.txt and sitemap.xml for sensitive information."""
+        try:
+            # --> Both files are independent, fetch them at the same time
+            robots, sitemap = await asyncio.gather(
+                self._check_robots(domain),
+                self._check_sitemap(domain)
             )
-            
-            try:
-                with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                    results['sitemap_xml'] = {
-                        'status': 'found',
-                        'content_type': response.headers.get('Content-Type', 'unknown')
-                    }
-            except urllib.error.HTTPError as e:
-                results['sitemap_xml'] = {
-                    'status': 'not_found',
-                    'error': str(e)
-                }
-                
-            return results
+            return {
+                'domain': domain,
+                'robots_txt': robots['robots_txt'],
+                'sitemap_xml': sitemap,
+                'sensitive_paths': robots['sensitive_paths']
+            }
             
         except Exception as e:
             self.logger.error(f"Error checking robots/sitemap for {domain}: {str(e)}")
@@ -144,4 +164,4 @@ class HTTPAnalyzer:
                 'domain': domain,
                 'status': 'error',
                 'error': str(e)
-            }
\ No newline at end of file
+            }
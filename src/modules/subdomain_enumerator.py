@@ -1,174 +1,248 @@
-import subprocess
-import socket
-from typing import List, Dict, Optional
+from typing import Awaitable, Callable, List, Dict, Optional, Set
 import os
-import httpx # type: ignore
+import random
+import re
+import aiohttp  # type: ignore
 import json
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import time
+from ..utils.dns_cache import TTLDNSCache
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
 
 class SubdomainEnumerator:
-    def __init__(self, domain: str, use_tools: bool = True, save_to_files: bool = True):
+    def __init__(self, domain: str, session: aiohttp.ClientSession, use_tools: bool = True,
+                 save_to_files: bool = True, dns_cache: Optional[TTLDNSCache] = None,
+                 tools: Optional[List[str]] = None):
         self.domain = domain
+        self.session = session
+        # --> Compiled once per target; the escaped domain keeps '.' literal and the per-line anchors
+        # --> drop blank lines and hosts outside the target when a whole tool file is scanned at once
+        self._domain_re = re.compile(
+            r'^[ \t]*((?:[a-z0-9_-]+\.)*' + re.escape(domain.lower()) + r')[ \t\r]*$',
+            re.MULTILINE
+        )
+        self.dns_cache = dns_cache or TTLDNSCache()
         self.use_tools = use_tools
         self.save_to_files = save_to_files
+        # --> Discovery tools are resolved once; callers can narrow them down to skip redundant sources
+        self._tool_runners = {
+            'subfinder': self._run_subfinder,
+            'assetfinder': self._run_assetfinder
+        }
+        self.tools = [name for name in self._tool_runners if tools is None or name in tools]
         self.reports_dir = 'reports'
         self.http_timeout = 10  # Seconds
-        self.batch_size = 100   # Initial batch size, will adjust dynamically
         self.max_connections = 50  # Max concurrent HTTP connections
         self.retries = 2        # Number of HTTP retries
-        self.rate_limit_delay = 0.1  # Delay between batches to avoid rate limiting
+        self.dns_concurrency = 500  # Max in-flight DNS lookups
+        self.resolve_workers = 20  # Pipeline workers resolving alive subdomains
+        self.queue_size = 1000  # Bound on hosts waiting between pipeline stages
+        # --> Instance-wide caps so every caller shares one bound on outbound probes and lookups
+        self.http_sem = asyncio.Semaphore(self.max_connections)
+        self.dns_sem = asyncio.Semaphore(self.dns_concurrency)
 
         if not os.path.exists(self.reports_dir):
             os.makedirs(self.reports_dir)
 
-    def _run_subfinder(self) -> List[str]:
-        """Run subfinder tool to discover subdomains."""
+    async def _run_tool(self, *args: str, on_line: Optional[Callable[[str], Awaitable[None]]] = None) -> List[str]:
+        """Run a discovery tool, collecting its output line by line as it streams in."""
         try:
-            result = subprocess.run(
-                ['subfinder', '-d', self.domain, '-silent'], 
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+            proc = await asyncio.create_subprocess_exec(
+                *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
             )
-            return result.stdout.decode().splitlines()
-        except subprocess.CalledProcessError as e:
-            print(f"Error running subfinder: {e}")
+        except OSError as e:
+            # --> e.g. the tool isn't installed; the other tools' results still count
+            print(f"Error running {args[0]}: {str(e)}")
             return []
+        lines = []
+        async for raw in proc.stdout:
+            line = raw.decode().rstrip('\n')
+            lines.append(line)
+            if on_line is not None:
+                await on_line(line)  # --> Hand each host downstream while the tool is still running
+        if await proc.wait() != 0:
+            # --> The streamed lines were already probed downstream, so keep them and the saved file in step
+            print(f"Warning: {args[0]} exited with status {proc.returncode}, keeping {len(lines)} line(s) it printed")
+        return lines
+
+    async def _run_subfinder(self, on_line: Optional[Callable[[str], Awaitable[None]]] = None) -> List[str]:
+        """Run subfinder tool to discover subdomains."""
+        return await self._run_tool('subfinder', '-d', self.domain, '-silent', on_line=on_line)
 
-    def _run_assetfinder(self) -> List[str]:
+    async def _run_assetfinder(self, on_line: Optional[Callable[[str], Awaitable[None]]] = None) -> List[str]:
         """Run assetfinder tool to discover subdomains."""
-        try:
-            result = subprocess.run(
-                ['assetfinder', '-subs-only', self.domain], 
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
-            )
-            return result.stdout.decode().splitlines()
-        except subprocess.CalledProcessError as e:
-            print(f"Error running assetfinder: {e}")
-            return []
+        return await self._run_tool('assetfinder', '-subs-only', self.domain, on_line=on_line)
 
-    async def _check_http_status(self, subdomain: str, client: httpx.AsyncClient) -> bool:
+    async def _run_and_save(self, name: str, on_line: Optional[Callable[[str], Awaitable[None]]] = None) -> List[str]:
+        """Run one discovery tool and save its results without waiting for the other tools."""
+        found = await self._tool_runners[name](on_line)
+        if self.save_to_files:
+            await asyncio.to_thread(self._save_subdomains_to_file, found, f"{name}.txt")
+        return found
+
+    async def _probe(self, request, url: str) -> int:
+        """Issue a single liveness request and return its status code."""
+        async with request(
+            url,
+            allow_redirects=True,
+            timeout=aiohttp.ClientTimeout(total=self.http_timeout),
+            ssl=False  # Warning: Disables SSL verification - use with caution
+        ) as response:
+            return response.status
+
+    async def _check_http_status(self, subdomain: str) -> bool:
         """Check if subdomain is alive with retries."""
         url = f"http://{subdomain}"
         for attempt in range(self.retries + 1):
             try:
-                response = await client.get(url, follow_redirects=True, timeout=self.http_timeout)
-                if response.status_code < 400:
+                async with self.http_sem:
+                    # --> HEAD is enough to read the status without pulling the page body
+                    status = await self._probe(self.session.head, url)
+                    if status in (405, 501):  # --> Server refuses HEAD, fall back to GET
+                        status = await self._probe(self.session.get, url)
+                if status < 400:
                     return True
-            except (httpx.RequestError, httpx.TooManyRedirects, httpx.TimeoutException):
+            except (aiohttp.ClientConnectorError, aiohttp.TooManyRedirects):
+                return False  # --> Refused, unresolvable or looping: retrying won't change the answer
+            except (aiohttp.ClientError, asyncio.TimeoutError):
                 if attempt == self.retries:
                     return False
-                await asyncio.sleep(1)
+                # --> Transient failure, back off exponentially with jitter outside the semaphore
+                await asyncio.sleep(0.1 * (2 ** attempt) + random.uniform(0, 0.1))
         return False
 
     async def check_alive_subdomains(self, subdomains: List[str]) -> List[str]:
-        """Check subdomains in concurrent batches with connection pooling."""
-        alive_subdomains = []
-        limits = httpx.Limits(
-            max_connections=self.max_connections,
-            max_keepalive_connections=self.max_connections
-        )
-
-        async with httpx.AsyncClient(
-            limits=limits,
-            timeout=self.http_timeout,
-            verify=False  # Warning: Disables SSL verification - use with caution
-        ) as client:
-            for i in range(0, len(subdomains), self.batch_size):
-                batch = subdomains[i:i + self.batch_size]
-                tasks = [self._check_http_status(sd, client) for sd in batch]
-                results = await asyncio.gather(*tasks)
-                
-                alive_batch = [sd for sd, alive in zip(batch, results) if alive]
-                alive_subdomains.extend(alive_batch)
-                print(f"Checked {i + len(batch)}/{len(subdomains)} | Alive: {len(alive_batch)}")
-
-                # Adjust batch size dynamically based on response times
-                if len(alive_batch) / len(batch) < 0.1:  # If less than 10% are alive, reduce batch size
-                    self.batch_size = max(50, self.batch_size // 2)
-                elif len(alive_batch) / len(batch) > 0.9:  # If more than 90% are alive, increase batch size
-                    self.batch_size = min(200, self.batch_size * 2)
-
-                await asyncio.sleep(self.rate_limit_delay)  # Respect rate limits
+        """Check all subdomains concurrently over the shared connection pool."""
+        # --> One gather over the whole list; http_sem keeps max_connections probes in flight and a
+        # --> slot is refilled as soon as one frees up, so a slow host never stalls the rest
+        results = await asyncio.gather(*(self._check_http_status(sd) for sd in subdomains))
+        alive_subdomains = [sd for sd, alive in zip(subdomains, results) if alive]
 
         print(f"Total alive subdomains: {len(alive_subdomains)}")
         return alive_subdomains
 
-    def _resolve_dns(self, subdomain: str) -> Optional[Dict]:
+    async def _resolve_dns(self, subdomain: str) -> Optional[Dict]:
         """Resolve DNS records for a subdomain."""
-        try:
-            ipv4 = socket.gethostbyname(subdomain)
-            return {'subdomain': subdomain, 'ipv4': ipv4}
-        except socket.gaierror:
-            return None
+        async with self.dns_sem:
+            try:
+                addresses = await self.dns_cache.resolve(subdomain)
+                return {'subdomain': subdomain, 'ipv4': addresses[0]}
+            except (OSError, UnicodeError):
+                return None
 
     async def resolve_subdomains(self, subdomains: List[str]) -> List[Dict]:
-        """Resolve DNS for all subdomains using thread pool."""
-        with ThreadPoolExecutor(max_workers=50) as executor:
-            loop = asyncio.get_event_loop()
-            futures = [
-                loop.run_in_executor(executor, self._resolve_dns, sd)
-                for sd in subdomains
-            ]
-            results = await asyncio.gather(*futures)
-            return [res for res in results if res]
+        """Resolve DNS for all subdomains concurrently on the event loop."""
+        results = await asyncio.gather(*(self._resolve_dns(sd) for sd in subdomains))
+        return [res for res in results if res]
 
     def _save_subdomains_to_file(self, subdomains: List[str], filename: str):
         """Save subdomains to a text file."""
         filepath = os.path.join(self.reports_dir, filename)
-        with open(filepath, 'w') as f:
-            f.write('\n'.join(subdomains))
+        # --> Stream the lines through a large buffer instead of building one joined string
+        with open(filepath, 'w', buffering=1 << 20) as f:
+            f.writelines(f"{sd}\n" for sd in subdomains)
         print(f"Saved {len(subdomains)} subdomains to {filepath}")
 
-    def _combine_subdomains(self) -> List[str]:
+    def _combine_subdomains(self) -> Set[str]:
         """Combine and deduplicate subdomains from different sources."""
         combined = set()
-        for file in ['subfinder.txt', 'assetfinder.txt']:
-            path = os.path.join(self.reports_dir, file)
+        for name in self.tools:
+            path = os.path.join(self.reports_dir, f"{name}.txt")
             if os.path.exists(path):
                 with open(path, 'r') as f:
-                    combined.update(f.read().splitlines())
-        return sorted(combined)
+                    # --> DNS names are case-insensitive, normalise so tool variants collapse to one entry.
+                    # --> One findall over the file keeps the per-host matching inside the regex engine.
+                    combined.update(self._domain_re.findall(f.read().lower()))
+        return combined
 
     async def enumerate(self) -> Dict:
-        """Main enumeration workflow with progress tracking."""
+        """Main enumeration workflow, run as a discovery -> liveness -> DNS pipeline."""
         start_time = time.time()
-        
-        # Run enumeration tools
-        if self.use_tools:
-            print("Starting subdomain discovery...")
-            subfinder_results = await asyncio.to_thread(self._run_subfinder)
-            assetfinder_results = await asyncio.to_thread(self._run_assetfinder)
-            
-            if self.save_to_files:
-                self._save_subdomains_to_file(subfinder_results, "subfinder.txt")
-                self._save_subdomains_to_file(assetfinder_results, "assetfinder.txt")
-
-        # Combine and check subdomains
-        print("\nCombining results...")
-        combined = self._combine_subdomains()
-        print(f"Total unique subdomains found: {len(combined)}")
-
-        print("\nChecking alive subdomains...")
-        alive = await self.check_alive_subdomains(combined)
-        resolved = await self.resolve_subdomains(alive)
+        discovered: asyncio.Queue = asyncio.Queue(self.queue_size)
+        alive_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        seen: Set[str] = set()
+        alive: List[str] = []
+        resolved: List[Dict] = []
+
+        async def offer(line: str) -> None:
+            # --> Normalise and dedupe as hosts arrive, only new in-scope names go downstream
+            if match := self._domain_re.match(line.lower()):
+                host = match.group(1)
+                if host not in seen:
+                    seen.add(host)
+                    await discovered.put(host)
+
+        async def check_liveness() -> None:
+            while (host := await discovered.get()) is not None:
+                if await self._check_http_status(host):
+                    alive.append(host)
+                    await alive_queue.put(host)
+
+        async def resolve() -> None:
+            while (host := await alive_queue.get()) is not None:
+                if record := await self._resolve_dns(host):
+                    resolved.append(record)
+
+        # --> Every stage runs at once: hosts are probed while the tools are still emitting them
+        # --> and resolved as soon as they answer, so wall time is the slowest stage, not the sum
+        checkers = [asyncio.ensure_future(check_liveness()) for _ in range(self.max_connections)]
+        resolvers = [asyncio.ensure_future(resolve()) for _ in range(self.resolve_workers)]
+        try:
+            if self.use_tools:
+                print("Starting subdomain discovery...")
+                # --> The tools run side by side as child processes, each saving its output as soon as it is done
+                await asyncio.gather(*(self._run_and_save(name, offer) for name in self.tools))
+            else:
+                for host in self._combine_subdomains():
+                    await offer(host)
+
+            for _ in checkers:
+                await discovered.put(None)  # --> Poison pill per worker once discovery is exhausted
+            await asyncio.gather(*checkers)
+            for _ in resolvers:
+                await alive_queue.put(None)
+            await asyncio.gather(*resolvers)
+        finally:
+            for task in checkers + resolvers:
+                task.cancel()
+            await asyncio.gather(*checkers, *resolvers, return_exceptions=True)
+
+        print(f"Total unique subdomains found: {len(seen)}")
+        print(f"Total alive subdomains: {len(alive)}")
+
+        # --> Only the (much smaller) alive list is sorted, to keep reports stable between runs
+        alive.sort()
+        resolved.sort(key=lambda record: record['subdomain'])
 
         # Save final results
         results = {
             'alive_subdomains': alive,
             'resolved_subdomains': resolved,
             'stats': {
-                'total_subdomains': len(combined),
+                'total_subdomains': len(seen),
                 'alive_count': len(alive),
                 'scan_duration': round(time.time() - start_time, 2)
             }
         }
 
         if self.save_to_files:
-            json_path = os.path.join(self.reports_dir, 'results.json')
-            with open(json_path, 'w') as f:
-                json.dump(results, f, indent=2)
-            self._save_subdomains_to_file(alive, 'alive.txt')
-            print(f"\nFull results saved to {json_path}")
+            # --> Serializing and writing a large result set would stall every other scan stage on the loop
+            await asyncio.to_thread(self._save_results, results)
 
         return results
+
+    def _save_results(self, results: Dict):
+        """Save the full results as JSON and the alive subdomains as text."""
+        json_path = os.path.join(self.reports_dir, 'results.json')
+        if orjson is not None:
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(json_path, 'w') as f:
+                json.dump(results, f, indent=2)
+        self._save_subdomains_to_file(results['alive_subdomains'], 'alive.txt')
+        print(f"\nFull results saved to {json_path}")
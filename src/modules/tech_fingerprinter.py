@@ -2,282 +2,344 @@ import re
 import json
 import asyncio
 import aiohttp  # type: ignore
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Pattern, Set, Tuple
 from ..utils.logger import Logger
 from ..utils.exceptions import ZoroToolkitError
 
+SIGNATURES = {
+    'frameworks': {
+        'Django': [
+            'csrfmiddlewaretoken',
+            'django-debug-toolbar',
+            '__django',
+        ],
+        'Flask': [
+            'Werkzeug',
+            'flask',
+            'Flask-Session'
+        ],
+        'Laravel': [
+            'laravel_session',
+            'XSRF-TOKEN',
+            'Laravel'
+        ],
+        'Express': [
+            'express.sid',
+            'connect.sid',
+            'Express'
+        ],
+        'Ruby on Rails': [
+            'X-Rack-Cache',
+            'X-Ruby-on-Rails',
+        ],
+        'Spring Boot': [
+            'X-Spring-Boot',
+            'spring-boot',
+        ],
+        'ASP.NET': [
+            'X-AspNet-Version',
+            'aspnet',
+        ],
+        'Symfony': [
+            'Symfony',
+            'symfony',
+        ],
+        'nginx': [
+            'nginx',
+            'X-NginX-Cache',
+            'nginx.com',
+            'nginx/1.',
+            'X-Powered-By: Express' 
+        ]
+
+    },
+    'cms': {
+        'WordPress': [
+            'wp-content',
+            'wp-includes',
+            'wp-json'
+        ],
+        'Drupal': [
+            'Drupal',
+            'drupal.js',
+            'sites/default'
+        ],
+        'Joomla': [
+            'joomla',
+            'com_content',
+            'Joomla!'
+        ],
+        'Magento': [
+            'Magento',
+            'skin/frontend'
+        ],
+        'Ghost': [
+            'ghost',
+            'ghost.min.js',
+        ]
+    },
+    'javascript': {
+        'React': [
+            'react.development.js',
+            'react.production.min.js',
+            'react-dom'
+        ],
+        'Vue.js': [
+            'vue.js',
+            'vue.min.js',
+            'vue-router'
+        ],
+        'Angular': [
+            'angular.js',
+            'ng-app',
+            'ng-controller'
+        ],
+        'Svelte': [
+            'svelte',
+            'svelte/internal'
+        ],
+        'Ember.js': [
+            'ember.js',
+            'ember-template-compiler.js'
+        ],
+        'Backbone.js': [
+            'backbone.js',
+            'Backbone.Model'
+        ]
+    },
+    'analytics': {
+        'Google Analytics': [
+            'ga.js',
+            'analytics.js',
+            'gtag'
+        ],
+        'Mixpanel': [
+            'mixpanel',
+            'mixpanel.min.js'
+        ],
+        'Hotjar': [
+            'hotjar.js',
+            'hjid'
+        ]
+    },
+    'security': {
+        'reCAPTCHA': [
+            'recaptcha',
+            'g-recaptcha',
+        ],
+        'Cloudflare': [
+            'cloudflare',
+            '__cfduid'
+        ],
+        'HSTS': [
+            'Strict-Transport-Security'
+        ]
+    },
+    'ecommerce': {
+        'Shopify': [
+            'shopify',
+            'cdn.shopify.com'
+        ],
+        'WooCommerce': [
+            'woocommerce',
+            'wc-ajax'
+        ],
+        'BigCommerce': [
+            'bigcommerce',
+            'cdn.bigcommerce.com'
+        ]
+    }
+}
+
+def _check_prefixes(techs: Dict[str, List[str]]) -> None:
+    """Reject a signature that is a prefix of another technology's in the same category."""
+    # --> Two signatures can only start at the same offset if one is a prefix of the other, and there
+    # --> the merged alternation reports just the first group; such a pair would hide a technology
+    owners = [(sig.lower(), tech) for tech, sigs in techs.items() for sig in sigs]
+    for sig, tech in owners:
+        for other, other_tech in owners:
+            if tech != other_tech and other.startswith(sig):
+                raise ValueError(f"Signature {sig!r} of {tech} is a prefix of {other!r} of {other_tech}")
+
+def _compile_signatures(signatures: Dict[str, Dict[str, List[str]]]) -> Dict[str, Tuple[Pattern, Dict[str, str]]]:
+    """Merge every signature of a category into one lowercase pattern with a named group per technology."""
+    matchers = {}
+    for category, techs in signatures.items():
+        _check_prefixes(techs)
+        groups = {f"t{i}": tech for i, tech in enumerate(techs)}
+        # --> The lookahead keeps matches zero-width, so hits at later offsets are never consumed.
+        # --> At a single offset only the first matching group is reported, which _check_prefixes makes safe.
+        alternation = '|'.join(
+            f"(?P<{group}>{'|'.join(re.escape(sig.lower()) for sig in techs[tech])})"
+            for group, tech in groups.items()
+        )
+        # --> Callers lowercase the text once, which is cheaper than case-folding inside the regex engine
+        matchers[category] = (re.compile(f"(?=(?:{alternation}))"), groups)
+    return matchers
+
+# --> Compiled once at import and shared by every TechFingerprinter instance
+SIGNATURE_MATCHERS = _compile_signatures(SIGNATURES)
+# --> Security headers collected during header analysis
+SECURITY_HEADERS = ('X-Frame-Options', 'X-XSS-Protection', 'Content-Security-Policy', 'Strict-Transport-Security')
+# --> Only the head of a page is fingerprinted, huge or hostile bodies can't blow up decode and regex time
+MAX_BODY_BYTES = 1_000_000
+# --> Meta tags and script sources share one pattern: a whole meta tag, or a script's src in group 1
+TAG_RE = re.compile(r'<(?:meta[^>]+>|script[^>]+src=["\']([^"\']+))')
+CONTENT_RE = re.compile(r'content=["\']([^"\']+)')
+
+def _scan_tags(content: str) -> Tuple[List[str], List[str]]:
+    """Collect meta tags and script sources from a page in a single pass over it."""
+    metas, scripts = [], []
+    # --> Plain substring tests rule out pages with neither tag before the regex walks them
+    if '<meta' in content or '<script' in content:
+        for tag in TAG_RE.finditer(content):
+            if src := tag.group(1):
+                scripts.append(src)
+            else:
+                metas.append(tag.group())
+    return metas, scripts
+
+def _match_category(category: str, text: str) -> List[str]:
+    """Return every technology of a category found in already lowercased text, in a single pass over it."""
+    pattern, groups = SIGNATURE_MATCHERS[category]
+    found = {}
+    for match in pattern.finditer(text):
+        found[groups[match.lastgroup]] = None
+        if len(found) == len(groups):
+            break  # --> Every technology in the category has matched, the rest of the text can't add any
+    return list(found)
+
 class TechFingerprinter:
-    
-    def __init__(self):
+    # --> Recommendation tables, looked up per detected technology instead of walking if/elif chains
+    FRAMEWORK_RECOMMENDATIONS = {
+        'Django': (
+            "Enable Django's built-in XSS protection",
+            "Configure Django's CSRF protection",
+            "Use Django's secure password hashing"
+        ),
+        'Laravel': (
+            "Enable Laravel's encryption features",
+            "Use Laravel's CSRF protection",
+            "Configure Laravel's authentication guards"
+        )
+    }
+    CMS_RECOMMENDATIONS = (
+        "Keep CMS and all plugins up to date",
+        "Implement strong admin authentication",
+        "Use security plugins specific to your CMS",
+        "Regular security audits and updates"
+    )
+    SECURE_FRAMEWORKS = frozenset(('Django', 'Laravel'))  # Known secure frameworks
+
+    def __init__(self, session: aiohttp.ClientSession):
         self.logger = Logger()
+        self.session = session
         self._load_signatures()
         
     def _load_signatures(self):
-        self.signatures = {
-            'frameworks': {
-                'Django': [
-                    'csrfmiddlewaretoken',
-                    'django-debug-toolbar',
-                    '__django',
-                ],
-                'Flask': [
-                    'Werkzeug',
-                    'flask',
-                    'Flask-Session'
-                ],
-                'Laravel': [
-                    'laravel_session',
-                    'XSRF-TOKEN',
-                    'Laravel'
-                ],
-                'Express': [
-                    'express.sid',
-                    'connect.sid',
-                    'Express'
-                ],
-                'Ruby on Rails': [
-                    'X-Rack-Cache',
-                    'X-Ruby-on-Rails',
-                ],
-                'Spring Boot': [
-                    'X-Spring-Boot',
-                    'spring-boot',
-                ],
-                'ASP.NET': [
-                    'X-AspNet-Version',
-                    'aspnet',
-                ],
-                'Symfony': [
-                    'Symfony',
-                    'symfony',
-                ],
-                'nginx': [
-                    'nginx',
-                    'X-NginX-Cache',
-                    'nginx.com',
-                    'nginx/1.',
-                    'X-Powered-By: Express' 
-                ]
-
-            },
-            'cms': {
-                'WordPress': [
-                    'wp-content',
-                    'wp-includes',
-                    'wp-json'
-                ],
-                'Drupal': [
-                    'Drupal',
-                    'drupal.js',
-                    'sites/default'
-                ],
-                'Joomla': [
-                    'joomla',
-                    'com_content',
-                    'Joomla!'
-                ],
-                'Magento': [
-                    'Magento',
-                    'skin/frontend'
-                ],
-                'Ghost': [
-                    'ghost',
-                    'ghost.min.js',
-                ]
-            },
-            'javascript': {
-                'React': [
-                    'react.development.js',
-                    'react.production.min.js',
-                    'react-dom'
-                ],
-                'Vue.js': [
-                    'vue.js',
-                    'vue.min.js',
-                    'vue-router'
-                ],
-                'Angular': [
-                    'angular.js',
-                    'ng-app',
-                    'ng-controller'
-                ],
-                'Svelte': [
-                    'svelte',
-                    'svelte/internal'
-                ],
-                'Ember.js': [
-                    'ember.js',
-                    'ember-template-compiler.js'
-                ],
-                'Backbone.js': [
-                    'backbone.js',
-                    'Backbone.Model'
-                ]
-            },
-            'analytics': {
-                'Google Analytics': [
-                    'ga.js',
-                    'analytics.js',
-                    'gtag'
-                ],
-                'Mixpanel': [
-                    'mixpanel',
-                    'mixpanel.min.js'
-                ],
-                'Hotjar': [
-                    'hotjar.js',
-                    'hjid'
-                ]
-            },
-            'security': {
-                'reCAPTCHA': [
-                    'recaptcha',
-                    'g-recaptcha',
-                ],
-                'Cloudflare': [
-                    'cloudflare',
-                    '__cfduid'
-                ],
-                'HSTS': [
-                    'Strict-Transport-Security'
-                ]
-            },
-            'ecommerce': {
-                'Shopify': [
-                    'shopify',
-                    'cdn.shopify.com'
-                ],
-                'WooCommerce': [
-                    'woocommerce',
-                    'wc-ajax'
-                ],
-                'BigCommerce': [
-                    'bigcommerce',
-                    'cdn.bigcommerce.com'
-                ]
-            }
-        }
+        self.signatures = SIGNATURES
 
     async def fingerprint(self, url: str) -> Dict:
         try:
-            async with aiohttp.ClientSession() as session:
-                # Gather all required data concurrently
-                results = await asyncio.gather(
-                    self._analyze_headers(session, url),
-                    self._analyze_source(session, url),
-                    self._analyze_scripts(session, url),
-                    return_exceptions=True
-                )
-                
-                headers_info, source_info, scripts_info = results
-                
-                detected_tech = self._combine_findings(
-                    headers_info.get('technologies', []) if isinstance(headers_info, dict) else [],
-                    source_info.get('technologies', []) if isinstance(source_info, dict) else [],
-                    scripts_info.get('technologies', []) if isinstance(scripts_info, dict) else []
-                )
-                
-                security_insights = self._generate_security_insights(detected_tech)
-                
-                return {
-                    'url': url,
-                    'status': 'success',
-                    'technologies': detected_tech,
-                    'security_insights': security_insights,
-                    'recommendations': self._generate_recommendations(detected_tech)
-                }
-                
+            # --> Fetch the page once; every analyzer reads the same headers and body
+            try:
+                async with self.session.get(url) as response:
+                    headers = response.headers
+                    # --> read(n) stops at whatever is buffered; readexactly waits for the full cap,
+                    # --> and a shorter page ends in IncompleteReadError carrying everything received
+                    try:
+                        raw = await response.content.readexactly(MAX_BODY_BYTES)
+                    except asyncio.IncompleteReadError as e:
+                        raw = e.partial
+                    content = raw.decode(response.charset or 'utf-8', errors='replace')
+            except Exception as e:
+                self.logger.error(f"Fetching {url} failed: {str(e)}")
+                headers, content = {}, ''
+            
+            metas, scripts = _scan_tags(content)  # --> One tokenizing pass feeds both body analyzers
+            detected_tech = self._combine_findings(
+                self._analyze_headers(headers)['technologies'],
+                self._analyze_source(content, metas)['technologies'],
+                self._analyze_scripts(scripts, url)['technologies']
+            )
+            
+            security_insights = self._generate_security_insights(detected_tech)
+            
+            return {
+                'url': url,
+                'status': 'success',
+                'technologies': detected_tech,
+                'security_insights': security_insights,
+                'recommendations': self._generate_recommendations(detected_tech)
+            }
+            
         except Exception as e:
             self.logger.error(f"Technology fingerprinting failed for {url}: {str(e)}")
             raise ZoroToolkitError(f"Fingerprinting failed: {str(e)}")
 
-    async def _analyze_headers(self, session: aiohttp.ClientSession, url: str) -> Dict:
+    def _analyze_headers(self, headers) -> Dict:
         try:
-            async with session.get(url) as response:
-                headers = dict(response.headers)
-                technologies = []
-                
-                if server := headers.get('Server'):
-                    technologies.append(('server', server))
+            # --> Read aiohttp's case-insensitive multidict as is, copying it into a dict
+            # --> costs an allocation per scan and makes every lookup case-sensitive
+            technologies = set()
+
+            if server := headers.get('Server'):
+                technologies.add(('server', server))
+
+            for header, value in headers.items():
+                if 'powered-by' in header.lower():
+                    technologies.add(('powered-by', value))
                     
-                for header in headers:
-                    if 'powered-by' in header.lower():
-                        technologies.append(('powered-by', headers[header]))
-                        
-                security_headers = {
-                    'X-Frame-Options': headers.get('X-Frame-Options'),
-                    'X-XSS-Protection': headers.get('X-XSS-Protection'),
-                    'Content-Security-Policy': headers.get('Content-Security-Policy'),
-                    'Strict-Transport-Security': headers.get('Strict-Transport-Security')
-                }
-                
-                return {
-                    'technologies': technologies,
-                    'security_headers': security_headers
-                }
+            security_headers = {name: headers.get(name) for name in SECURITY_HEADERS}
+            
+            return {
+                'technologies': technologies,
+                'security_headers': security_headers
+            }
                 
         except Exception as e:
             self.logger.error(f"Header analysis failed: {str(e)}")
-            return {'technologies': [], 'security_headers': {}}
+            return {'technologies': set(), 'security_headers': {}}
 
-    async def _analyze_source(self, session: aiohttp.ClientSession, url: str) -> Dict:
+    def _analyze_source(self, content: str, metas: List[str]) -> Dict:
         try:
-            async with session.get(url) as response:
-                content = await response.text()
-                technologies = []
-                
-                meta_tags = re.findall(r'<meta[^>]+>', content)
-                for meta in meta_tags:
-                    if 'generator' in meta.lower():
-                        if match := re.search(r'content=["\']([^"\']+)', meta):
-                            technologies.append(('generator', match.group(1)))
-                
-                # Framework detection
-                for framework, signatures in self.signatures['frameworks'].items():
-                    if any(sig.lower() in content.lower() for sig in signatures):
-                        technologies.append(('framework', framework))
-                
-                # CMS detection
-                for cms, signatures in self.signatures['cms'].items():
-                    if any(sig.lower() in content.lower() for sig in signatures):
-                        technologies.append(('cms', cms))
-                
-                # E-commerce detection
-                for ecommerce, signatures in self.signatures['ecommerce'].items():
-                    if any(sig.lower() in content.lower() for sig in signatures):
-                        technologies.append(('ecommerce', ecommerce))
-                
-                return {'technologies': technologies}
+            technologies = set()
+            
+            for meta in metas:
+                if 'generator' in meta.lower():
+                    if match := CONTENT_RE.search(meta):
+                        technologies.add(('generator', match.group(1)))
+            
+            # Framework, CMS and e-commerce detection, one pass over the page per category
+            content_lc = content.lower()  # --> Lowercased once, shared by every category
+            for category in ('frameworks', 'cms', 'ecommerce'):
+                technologies.update((category, tech) for tech in _match_category(category, content_lc))
+            
+            return {'technologies': technologies}
                 
         except Exception as e:
             self.logger.error(f"Source analysis failed: {str(e)}")
-            return {'technologies': []}
+            return {'technologies': set()}
 
-    async def _analyze_scripts(self, session: aiohttp.ClientSession, url: str) -> Dict:
+    def _analyze_scripts(self, script_tags: List[str], url: str) -> Dict:
         """Analyze JavaScript files and dependencies."""
         try:
-            async with session.get(url) as response:
-                content = await response.text()
-                technologies = []
-                
-                # Extract script sources
-                script_tags = re.findall(r'<script[^>]+src=["\']([^"\']+)', content)
-                
-                # Analyze each script source
-                for script in script_tags:
-                    script_url = script if script.startswith(('http://', 'https://')) else f"{url.rstrip('/')}/{script.lstrip('/')}"
-                    
-                    for tech_type, signatures in self.signatures['javascript'].items():
-                        if any(sig.lower() in script_url.lower() for sig in signatures):
-                            technologies.append(('javascript', tech_type))
-                
-                return {'technologies': technologies}
+            technologies = set()
+            
+            # Analyze every script source in one pass, signatures never span a newline
+            script_urls = '\n'.join(
+                script if script.startswith(('http://', 'https://')) else f"{url.rstrip('/')}/{script.lstrip('/')}"
+                for script in script_tags
+            ).lower()
+            technologies.update(('javascript', tech) for tech in _match_category('javascript', script_urls))
+            
+            return {'technologies': technologies}
                 
         except Exception as e:
             self.logger.error(f"Script analysis failed: {str(e)}")
-            return {'technologies': []}
+            return {'technologies': set()}
 
-    def _combine_findings(self, *tech_lists: List) -> Dict:
+    def _combine_findings(self, *tech_lists: Set) -> Dict:
         """Combine and categorize all detected technologies."""
         combined = {
             'server': set(),
@@ -316,12 +378,11 @@ class TechFingerprinter:
             ])
         
         # Framework analysis
-        if 'frameworks' in detected_tech:
-            for framework in detected_tech['frameworks']:
-                if framework in ['Django', 'Laravel']:  # Known secure frameworks
-                    insights['positive_aspects'].append(
-                        f"Using {framework} framework with built-in security features"
-                    )
+        insights['positive_aspects'].extend(
+            f"Using {framework} framework with built-in security features"
+            for framework in detected_tech.get('frameworks', ())
+            if framework in self.SECURE_FRAMEWORKS
+        )
         
         # CMS analysis
         if 'cms' in detected_tech:
@@ -341,28 +402,11 @@ class TechFingerprinter:
         recommendations.append("Enable security headers including CSP and HSTS")
         
         # Framework-specific recommendations
-        if 'frameworks' in detected_tech:
-            for framework in detected_tech['frameworks']:
-                if framework == 'Django':
-                    recommendations.extend([
-                        "Enable Django's built-in XSS protection",
-                        "Configure Django's CSRF protection",
-                        "Use Django's secure password hashing"
-                    ])
-                elif framework == 'Laravel':
-                    recommendations.extend([
-                        "Enable Laravel's encryption features",
-                        "Use Laravel's CSRF protection",
-                        "Configure Laravel's authentication guards"
-                    ])
+        for framework in detected_tech.get('frameworks', ()):
+            recommendations.extend(self.FRAMEWORK_RECOMMENDATIONS.get(framework, ()))
         
         # CMS-specific recommendations
         if 'cms' in detected_tech:
-            recommendations.extend([
-                "Keep CMS and all plugins up to date",
-                "Implement strong admin authentication",
-                "Use security plugins specific to your CMS",
-                "Regular security audits and updates"
-            ])
+            recommendations.extend(self.CMS_RECOMMENDATIONS)
         
         return recommendations
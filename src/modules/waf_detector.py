@@ -1,46 +1,81 @@
 # src/modules/waf_detector.py
 import re
-import requests
-from typing import Dict, List
+import aiohttp  # type: ignore
+from typing import Dict, List, Set
 from ..utils.logger import Logger
 
+WAF_SIGNATURES = {
+    'Cloudflare': [
+        'cloudflare',
+        '__cfduid',
+        'cf-ray',
+        'cf-cache-status'
+    ],
+    'AWS WAF': [
+        'x-amzn-RequestId',
+        'x-amz-cf-id',
+        'x-amz-id'
+    ],
+    'Akamai': [
+        'akamai',
+        'ak_bmsc',
+        'bm_sz'
+    ],
+    'Imperva': [
+        'incap_ses',
+        '_incapsula_version',
+        'visid_incap'
+    ],
+    'F5 BIG-IP': [
+        'BigIP',
+        'BIGipServer',
+        'F5_ST'
+    ]
+}
+
+def _check_prefixes(signatures: Dict[str, List[str]]) -> None:
+    """Reject a signature that is a case-insensitive prefix of another WAF's."""
+    # --> Only a prefix pair can start at the same offset, and there the merged alternation
+    # --> reports just the first group, which would hide the other WAF
+    owners = [(sig.lower(), waf_name) for waf_name, sigs in signatures.items() for sig in sigs]
+    for sig, waf_name in owners:
+        for other, other_waf in owners:
+            if waf_name != other_waf and other.startswith(sig):
+                raise ValueError(f"Signature {sig!r} of {waf_name} is a prefix of {other!r} of {other_waf}")
+
+# --> Every WAF's signatures merged into one case-insensitive pattern, compiled once at import.
+# --> Each WAF gets a named group and the lookahead keeps matches zero-width, so a single scan
+# --> reports every WAF present instead of running one matcher per WAF over the same text.
+_check_prefixes(WAF_SIGNATURES)
+WAF_GROUPS = {f"w{i}": waf_name for i, waf_name in enumerate(WAF_SIGNATURES)}
+WAF_MATCHER = re.compile(
+    '(?=(?:' + '|'.join(
+        f"(?P<{group}>{'|'.join(re.escape(sig) for sig in WAF_SIGNATURES[waf_name])})"
+        for group, waf_name in WAF_GROUPS.items()
+    ) + '))',
+    re.IGNORECASE
+)
+
+def _match_wafs(text: str) -> Set[str]:
+    """Return the names of every WAF whose signatures appear in text."""
+    found = set()
+    for match in WAF_MATCHER.finditer(text):
+        found.add(WAF_GROUPS[match.lastgroup])
+        if len(found) == len(WAF_GROUPS):
+            break  # --> Every WAF already matched, nothing left to look for
+    return found
+
 class WAFDetector:
     """Web Application Firewall (WAF) detection module."""
     
-    def __init__(self):
+    def __init__(self, session: aiohttp.ClientSession):
         self.logger = Logger()
+        self.session = session
         self.timeout = 10
         self.user_agent = "Zoro-Toolkit/1.0"
-        self.waf_signatures = {
-            'Cloudflare': [
-                'cloudflare',
-                '__cfduid',
-                'cf-ray',
-                'cf-cache-status'
-            ],
-            'AWS WAF': [
-                'x-amzn-RequestId',
-                'x-amz-cf-id',
-                'x-amz-id'
-            ],
-            'Akamai': [
-                'akamai',
-                'ak_bmsc',
-                'bm_sz'
-            ],
-            'Imperva': [
-                'incap_ses',
-                '_incapsula_version',
-                'visid_incap'
-            ],
-            'F5 BIG-IP': [
-                'BigIP',
-                'BIGipServer',
-                'F5_ST'
-            ]
-        }
+        self.waf_signatures = WAF_SIGNATURES
 
-    def detect_waf(self, url: str) -> Dict:
+    async def detect_waf(self, url: str) -> Dict:
         try:
             headers = {
                 'User-Agent': self.user_agent,
@@ -50,38 +85,31 @@ class WAFDetector:
                 'X-Originating-IP': '127.0.0.1'
             }
             
-            response = requests.get(url, headers=headers, timeout=self.timeout, verify=True)
-            detected_wafs = []
-            
-            # Check response headers and cookies for WAF signatures
-            all_headers = {k.lower(): v for k, v in response.headers.items()}
-            cookies = {k.lower(): v for k, v in response.cookies.items()}
-            
-            for waf_name, signatures in self.waf_signatures.items():
-                for signature in signatures:
-                    sig_lower = signature.lower()
-                    # Check in headers
-                    if any(sig_lower in header for header in all_headers.keys()):
-                        detected_wafs.append(waf_name)
-                        break
-                    # Check in header values
-                    if any(sig_lower in str(value).lower() for value in all_headers.values()):
-                        detected_wafs.append(waf_name)
-                        break
-                    # Check in cookies
-                    if any(sig_lower in cookie for cookie in cookies.keys()):
-                        detected_wafs.append(waf_name)
-                        break
-            
-            # Remove duplicates while preserving order
-            detected_wafs = list(dict.fromkeys(detected_wafs))
+            async with self.session.get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                status_code = response.status
+                server = response.headers.get('Server', 'Not disclosed')
+                
+                # Check header names and values for WAF signatures. Cookie names are covered by the
+                # raw Set-Cookie values, so the parsed cookie jar is never built just to be scanned.
+                # Fused into one blob so the matcher runs once; \x01 never occurs in a
+                # signature, so no match can straddle two fields.
+                blob = '\x01'.join([*response.headers.keys(), *response.headers.values()])
+
+            found = _match_wafs(blob)
+
+            # Report in signature order so results are stable between runs
+            detected_wafs = [waf_name for waf_name in WAF_SIGNATURES if waf_name in found]
             
             return {
                 'url': url,
                 'waf_detected': bool(detected_wafs),
                 'detected_wafs': detected_wafs,
-                'status_code': response.status_code,
-                'server': response.headers.get('Server', 'Not disclosed'),
+                'status_code': status_code,
+                'server': server,
                 'recommendations': self._generate_recommendations(detected_wafs)
             }
             
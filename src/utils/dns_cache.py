@@ -0,0 +1,134 @@
+# src/utils/dns_cache.py
+import asyncio
+import functools
+import ipaddress
+import itertools
+import socket
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from aiohttp.abc import AbstractResolver  # type: ignore
+from .logger import Logger
+
+try:
+    import aiodns  # type: ignore
+except ImportError:
+    aiodns = None
+
+class TTLDNSCache:
+    """In-process LRU cache of A records with a TTL, shared by every module of a scan."""
+
+    def __init__(self, ttl: float = 900, nameservers: Optional[List[str]] = None, timeout: float = 2,
+                 maxsize: int = 100_000, channels: int = 4, tries: int = 2, negative_ttl: float = 60):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.nameservers = nameservers
+        self.timeout = timeout
+        self.tries = tries
+        self._cache: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self.channels = channels
+        self._resolvers = None  # --> Round-robin over long-lived c-ares channels, built on first lookup
+        self._executor: Optional[ThreadPoolExecutor] = None  # --> getaddrinfo fallback pool, only without aiodns
+        if nameservers and aiodns is None:
+            Logger().warning("aiodns is not installed, lookups use the system resolver and ignore the custom nameservers")
+
+    def get(self, host: str) -> Optional[List[str]]:
+        """Return the cached addresses for host (empty if it is known not to exist), or None when missing or expired."""
+        entry = self._cache.get(host)
+        if entry is None:
+            return None
+        expires_at, addresses = entry
+        if expires_at < time.monotonic():
+            self._cache.pop(host, None)
+            return None
+        self._cache.move_to_end(host)
+        return addresses
+
+    def set(self, host: str, addresses: List[str], ttl: Optional[float] = None) -> None:
+        """Store addresses for host for the given TTL, or the configured one."""
+        self._cache[host] = (time.monotonic() + (self.ttl if ttl is None else ttl), list(addresses))
+        self._cache.move_to_end(host)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)  # --> Evict the least recently used host
+
+    async def resolve(self, host: str) -> List[str]:
+        """Resolve host to its IPv4 addresses, answering from the cache when possible."""
+        try:
+            ipaddress.ip_address(host)
+            return [host]  # --> Already an address, nothing to look up
+        except ValueError:
+            pass
+
+        addresses = self.get(host)
+        if addresses is not None:
+            if not addresses:
+                raise socket.gaierror(f"No addresses found for {host} (cached)")
+            return addresses
+
+        if aiodns is not None:
+            if self._resolvers is None:
+                self._resolvers = itertools.cycle([
+                    aiodns.DNSResolver(nameservers=self.nameservers, timeout=self.timeout, tries=self.tries)
+                    for _ in range(self.channels)
+                ])
+            try:
+                result = await next(self._resolvers).gethostbyname(host, socket.AF_INET)
+            except aiodns.error.DNSError as e:
+                if e.args and e.args[0] in (aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA):
+                    # --> Remember names that don't exist for a short while, wildcard-free targets
+                    # --> and repeated tool output otherwise re-query every dead name
+                    self.set(host, [], ttl=self.negative_ttl)
+                raise socket.gaierror(f"DNS resolution failed for {host}: {e}") from e
+            addresses = list(result.addresses)
+        else:
+            # --> Without c-ares fall back to getaddrinfo on a dedicated pool. The calls mostly wait on
+            # --> the network, so the pool is far wider than the loop's default executor, and callers
+            # --> give up after the configured timeout instead of the libc resolver's ~20s.
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=200, thread_name_prefix='dns')
+            try:
+                infos = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(
+                        self._executor,
+                        functools.partial(socket.getaddrinfo, host, None, socket.AF_INET, socket.SOCK_STREAM)
+                    ),
+                    timeout=self.timeout * self.tries
+                )
+            except asyncio.TimeoutError as e:
+                raise socket.gaierror(f"DNS resolution timed out for {host}") from e
+            except socket.gaierror as e:
+                if e.errno == socket.EAI_NONAME:
+                    self.set(host, [], ttl=self.negative_ttl)
+                raise
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+
+        if not addresses:
+            raise socket.gaierror(f"No addresses found for {host}")
+
+        self.set(host, addresses)
+        return addresses
+
+class CachingResolver(AbstractResolver):
+    """aiohttp resolver that answers lookups from a shared TTLDNSCache."""
+
+    def __init__(self, cache: TTLDNSCache):
+        self.cache = cache
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict]:
+        addresses = await self.cache.resolve(host)
+        return [
+            {
+                'hostname': host,
+                'host': address,
+                'port': port,
+                'family': socket.AF_INET,
+                'proto': 0,
+                'flags': socket.AI_NUMERICHOST
+            }
+            for address in addresses
+        ]
+
+    async def close(self) -> None:
+        pass
@@ -1,11 +1,20 @@
 import logging
+import os
 import traceback
 
-logging.basicConfig(
-    filename='logs/zoro_toolkit_errors.log', 
-    level=logging.ERROR, 
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# --> Errors go to their own logger; its file is only opened once something is actually logged,
+# --> so importing this module no longer configures the root logger or touches the disk
+_error_logger = logging.getLogger('zoro_toolkit.errors')
+
+def _get_error_logger() -> logging.Logger:
+    if not _error_logger.handlers:
+        os.makedirs('logs', exist_ok=True)
+        handler = logging.FileHandler('logs/zoro_toolkit_errors.log', delay=True)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        _error_logger.addHandler(handler)
+        _error_logger.setLevel(logging.ERROR)
+        _error_logger.propagate = False
+    return _error_logger
 
 def log_error_details(exception, additional_context=None):
     error_details = f"Exception: {exception.__class__.__name__}\n"
@@ -13,38 +22,56 @@ def log_error_details(exception, additional_context=None):
     error_details += f"Traceback: {traceback.format_exc()}\n"
     if additional_context:
         error_details += f"Context: {additional_context}\n"
-    logging.error(error_details)
+    _get_error_logger().error(error_details)
 
 class ZoroToolkitError(Exception):
     def __init__(self, message="An error occurred in the Zoro Toolkit", error_code=None, context=None):
         self.message = message
         self.error_code = error_code
         self.context = context  
-        super().__init__(self.message)
+        super().__init__(message)
 
     def log_error(self):
         # Log the error with additional context
+        # --> Left to the handler: formatting the traceback walks the stack, errors caught silently shouldn't pay for it
         log_error_details(self, {"error_code": self.error_code, "context": self.context})
 
 class TaskExecutionError(ZoroToolkitError):
     def __init__(self, message="Task failed to execute", error_code=1001, task_id=None):
         super().__init__(message, error_code, context={"task_id": task_id})
-        self.log_error()
+
+# --> Template for rate limit messages built from the token counts
+RATE_LIMIT_MESSAGE = "Rate limit exceeded, need {} token(s), {:.2f} available."
 
 class RateLimitExceededError(ZoroToolkitError):
-    def __init__(self, message="Rate limit exceeded", error_code=1002, user_id=None):
+    def __init__(self, message=None, error_code=1002, user_id=None, tokens_needed=None, tokens_available=None):
+        self.tokens_needed = tokens_needed
+        self.tokens_available = tokens_available
         super().__init__(message, error_code, context={"user_id": user_id})
-        self.log_error()
+
+    @property
+    def message(self):
+        # --> Formatted on first read, callers that catch and retry never pay for the string
+        if self._message is None:
+            if self.tokens_needed is None:
+                return "Rate limit exceeded"
+            self._message = RATE_LIMIT_MESSAGE.format(self.tokens_needed, self.tokens_available or 0)
+        return self._message
+
+    @message.setter
+    def message(self, value):
+        self._message = value
+
+    def __str__(self):
+        return self.message
 
 class NetworkError(ZoroToolkitError):
     def __init__(self, message="Network operation failed", error_code=1003, operation=None):
         super().__init__(message, error_code, context={"operation": operation})
-        self.log_error()
 
 class ConfigurationError(ZoroToolkitError):
     def __init__(self, message="Configuration error occurred", error_code=1004, config_key=None):
         super().__init__(message, error_code, context={"config_key": config_key})
-        self.log_error()
 
 def handle_exception(exception):
     exception.log_error()  # Log the exception details
\ No newline at end of file
@@ -1,17 +1,48 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import json
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 # Define custom log level for SUCCESS
 SUCCESS_LEVEL_NUM = 25
 logging.addLevelName(SUCCESS_LEVEL_NUM, "SUCCESS")
 
+# --> Every progress bar state rendered up front, indexed by filled length
+PROGRESS_BAR_LENGTH = 50
+PROGRESS_BARS = tuple(
+    '█' * filled + '░' * (PROGRESS_BAR_LENGTH - filled) for filled in range(PROGRESS_BAR_LENGTH + 1)
+)
+PROGRESS_INTERVAL = 0.05  # Minimum seconds between progress redraws
+
 class Logger:
+    _instances: Dict[str, "Logger"] = {}
+    _last_percents = -1.0
+    _last_progress_at = 0.0
+
+    def __new__(cls, name: str = "ZoroToolkit"):
+        # One Logger per name, every module shares the same handlers
+        instance = cls._instances.get(name)
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instances[name] = instance
+        return instance
+
     def __init__(self, name: str = "ZoroToolkit"):
+        if getattr(self, '_initialized', False):
+            return
+        self._initialized = True
         self.logger = logging.getLogger(name)
         if not self.logger.handlers:
             self.logger.setLevel(logging.INFO)
@@ -26,28 +57,23 @@ class Logger:
             
             # Custom formatter with colors and symbols
             class ColoredFormatter(logging.Formatter):
-                COLORS = {
-                    'INFO': '\033[96m',     # Cyan
-                    'SUCCESS': '\033[92m',  # Green
-                    'WARNING': '\033[93m',  # Yellow
-                    'ERROR': '\033[91m',    # Red
-                    'DEBUG': '\033[94m',    # Blue
-                    'CRITICAL': '\033[95m', # Magenta
-                    'RESET': '\033[0m'
-                }
-                
-                SYMBOLS = {
-                    'INFO': 'ℹ',
-                    'SUCCESS': '✓',
-                    'WARNING': '⚠',
-                    'ERROR': '✗',
-                    'DEBUG': '🔍',
-                    'CRITICAL': '⚡'
+                # --> Color and symbol resolved per level number once, one lookup per record
+                PREFIXES = {
+                    logging.INFO: '\033[96mℹ ',          # Cyan
+                    SUCCESS_LEVEL_NUM: '\033[92m✓ ',     # Green
+                    logging.WARNING: '\033[93m⚠ ',       # Yellow
+                    logging.ERROR: '\033[91m✗ ',         # Red
+                    logging.DEBUG: '\033[94m🔍 ',        # Blue
+                    logging.CRITICAL: '\033[95m⚡ '      # Magenta
                 }
+                RESET = '\033[0m'
+
+                # --> The console stamp only has second resolution, so it's rendered once per second
+                _stamp_second = None
+                _stamp = ''
 
                 def format(self, record):
-                    color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-                    symbol = self.SYMBOLS.get(record.levelname, '')
+                    prefix = self.PREFIXES.get(record.levelno, self.RESET + ' ')
                     
                     # Get the raw message
                     msg = record.getMessage()
@@ -58,8 +84,11 @@ class Logger:
                     
                     # Format first line with timestamp, color, and symbol
                     if lines:
-                        timestamp = datetime.fromtimestamp(record.created).strftime('%H:%M:%S')
-                        formatted_lines.append(f"{timestamp} - {color}{symbol} {lines[0]}{self.COLORS['RESET']}")
+                        second = int(record.created)
+                        if second != self._stamp_second:
+                            self._stamp_second = second
+                            self._stamp = datetime.fromtimestamp(second).strftime('%H:%M:%S')
+                        formatted_lines.append(f"{self._stamp} - {prefix}{lines[0]}{self.RESET}")
                         
                         # Format subsequent lines with proper indentation and without timestamp
                         for line in lines[1:]:
@@ -70,22 +99,47 @@ class Logger:
                             else:
                                 formatted_lines.append(f"    {line}")
                     
-                    # Join all lines
-                    record.msg = '\n'.join(formatted_lines)
-                    return record.msg
+                    # Join all lines. Returned, not stored on record.msg, so the
+                    # --> file handler still sees the plain message without ANSI codes
+                    return '\n'.join(formatted_lines)
             
             console_formatter = ColoredFormatter()
             console_handler.setFormatter(console_formatter)
             
             # File Handler with JSON formatting
             log_file = logs_dir / f"zoro_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            file_handler = logging.FileHandler(log_file)
+            class BufferedFileHandler(logging.FileHandler):
+                # --> Records collect in a 64 KiB buffer instead of costing a write() each;
+                # --> errors are still flushed right away so they survive a crash
+                def _open(self):
+                    return open(self.baseFilename, self.mode, buffering=64 * 1024, encoding=self.encoding)
+
+                def emit(self, record):
+                    if self.stream is None:
+                        self.stream = self._open()
+                    try:
+                        self.stream.write(self.format(record) + self.terminator)
+                        if record.levelno >= logging.ERROR:
+                            self.stream.flush()
+                    except Exception:
+                        self.handleError(record)
+
+            file_handler = BufferedFileHandler(log_file)
             file_handler.setLevel(logging.DEBUG)
             
             class JSONFormatter(logging.Formatter):
+                # --> Date and time up to the second are rendered once per second, only the
+                # --> microseconds are formatted per record
+                _stamp_second = None
+                _stamp = ''
+
                 def format(self, record):
+                    second = int(record.created)
+                    if second != self._stamp_second:
+                        self._stamp_second = second
+                        self._stamp = datetime.fromtimestamp(second).strftime('%Y-%m-%dT%H:%M:%S')
                     log_entry = {
-                        'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+                        'timestamp': f"{self._stamp}.{int((record.created - second) * 1e6):06d}",
                         'level': record.levelname,
                         'message': record.getMessage(),
                         'module': record.module,
@@ -94,46 +148,62 @@ class Logger:
                     }
                     if hasattr(record, 'scan_data'):
                         log_entry['scan_data'] = record.scan_data
-                    return json.dumps(log_entry)
+                    if orjson is not None:
+                        return orjson.dumps(log_entry, default=str).decode()
+                    return json.dumps(log_entry, default=str)
             
             file_handler.setFormatter(JSONFormatter())
             
-            self.logger.addHandler(console_handler)
-            self.logger.addHandler(file_handler)
+            # --> Callers only enqueue the record; formatting and I/O run on the listener's thread
+            log_queue = queue.SimpleQueue()
+            self._listener = logging.handlers.QueueListener(
+                log_queue, console_handler, file_handler, respect_handler_level=True
+            )
+            self._listener.start()
+            # --> Drain the queue on exit; logging's own shutdown hook then flushes and closes the file
+            atexit.register(self._listener.stop)
+            self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
-    def _log_with_data(self, level: str, message: str, scan_data: Optional[dict] = None):
+    def _log_with_data(self, level: int, message: str, scan_data: Optional[dict] = None):
         """Internal method to log messages with optional scan data"""
+        # --> Levels arrive as ints from the wrappers, no name lookup on the logging module per call
+        if not self.logger.isEnabledFor(level):
+            return  # --> Filtered out, don't build the record at all
         if scan_data:
-            extra = {'scan_data': scan_data}
-            self.logger.log(getattr(logging, level), message, extra=extra)
+            self.logger.log(level, message, extra={'scan_data': scan_data})
         else:
-            self.logger.log(getattr(logging, level), message)
+            self.logger.log(level, message)
 
     def info(self, message: str, scan_data: Optional[dict] = None):
-        self._log_with_data('INFO', message, scan_data)
+        self._log_with_data(logging.INFO, message, scan_data)
 
     def success(self, message: str, scan_data: Optional[dict] = None):
         """Custom success level with green color"""
-        self.logger.log(SUCCESS_LEVEL_NUM, message, extra={'scan_data': scan_data} if scan_data else {})
+        self._log_with_data(SUCCESS_LEVEL_NUM, message, scan_data)
 
     def warning(self, message: str, scan_data: Optional[dict] = None):
-        self._log_with_data('WARNING', message, scan_data)
+        self._log_with_data(logging.WARNING, message, scan_data)
 
     def error(self, message: str, scan_data: Optional[dict] = None):
-        self._log_with_data('ERROR', message, scan_data)
+        self._log_with_data(logging.ERROR, message, scan_data)
 
     def debug(self, message: str, scan_data: Optional[dict] = None):
-        self._log_with_data('DEBUG', message, scan_data)
+        self._log_with_data(logging.DEBUG, message, scan_data)
 
     def critical(self, message: str, scan_data: Optional[dict] = None):
-        self._log_with_data('CRITICAL', message, scan_data)
+        self._log_with_data(logging.CRITICAL, message, scan_data)
 
     def progress(self, current: int, total: int, prefix: str = ''):
         """Display a progress bar in the console"""
-        bar_length = 50
-        filled_length = int(round(bar_length * current / float(total)))
         percents = round(100.0 * current / float(total), 1)
-        bar = '█' * filled_length + '░' * (bar_length - filled_length)
+        now = time.monotonic()
+        # --> Redraw only when the shown percentage moved and not faster than the terminal can be read,
+        # --> a tight scan loop would otherwise pay a write and a flush per item
+        if current != total and (percents == self._last_percents or now - self._last_progress_at < PROGRESS_INTERVAL):
+            return
+        self._last_percents = percents
+        self._last_progress_at = now
+        bar = PROGRESS_BARS[int(round(PROGRESS_BAR_LENGTH * current / float(total)))]
         
         # Format with timestamp
         timestamp = datetime.now().strftime('%H:%M:%S')
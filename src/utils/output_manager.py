@@ -1,3 +1,4 @@
+import gzip
 import json
 import os
 from datetime import datetime
@@ -6,26 +7,42 @@ from pathlib import Path
 import jinja2
 from .logger import Logger
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 class OutputManager:
     """Advanced output management with multiple format support."""
+    # --> The Jinja environment and compiled report template are shared by every instance
+    _jinja_env: Optional[jinja2.Environment] = None
+    _template: Optional[jinja2.Template] = None
     
-    def __init__(self, output_dir: str = "results"):
+    def __init__(self, output_dir: str = "results", compress: bool = False):
         self.logger = Logger()
         self.output_dir = Path(output_dir)
+        self.compress = compress  # --> Write compact, gzipped JSON for very large scans
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create templates directory if it doesn't exist
         self.template_dir = Path(__file__).parent / "templates"
-        self.template_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize Jinja2 environment
-        self.jinja_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(str(self.template_dir)),
-            autoescape=True
-        )
+        if OutputManager._template is None:
+            # Create templates directory if it doesn't exist
+            self.template_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Initialize Jinja2 environment
+            OutputManager._jinja_env = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(str(self.template_dir)),
+                autoescape=True,
+                auto_reload=False  # --> Skip the template file mtime check on every lookup
+            )
+            
+            # Create HTML template if it doesn't exist
+            self._create_default_template()
+            # --> Parsed and compiled once, every report renders the same template object
+            OutputManager._template = OutputManager._jinja_env.get_template("report_template.html")
         
-        # Create HTML template if it doesn't exist
-        self._create_default_template()
+        self.jinja_env = OutputManager._jinja_env
+        self.template = OutputManager._template
         
     def _create_default_template(self):
         """Create default HTML template if it doesn't exist."""
@@ -240,7 +257,10 @@ class OutputManager:
         Returns:
             Dict with paths to saved reports
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # --> One clock read per save, every report of the scan carries the same time
+        now = datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
+        generated = now.strftime('%Y-%m-%d %H:%M:%S')
         base_filename = f"{scan_type}_{target}_{timestamp}"
         
         saved_files = {}
@@ -250,15 +270,15 @@ class OutputManager:
         saved_files['json'] = str(json_path)
         
         # Save in HTML format
-        html_path = self._save_html(data, base_filename, target)
+        html_path = self._save_html(data, base_filename, target, generated)
         saved_files['html'] = str(html_path)
         
         # Save in markdown format
-        md_path = self._save_markdown(data, base_filename)
+        md_path = self._save_markdown(data, base_filename, generated)
         saved_files['markdown'] = str(md_path)
         
         # Save summary
-        summary_path = self._save_summary(data, base_filename)
+        summary_path = self._save_summary(data, base_filename, generated)
         saved_files['summary'] = str(summary_path)
         
         self.logger.info(f"Results saved to {self.output_dir}")
@@ -269,31 +289,45 @@ class OutputManager:
         json_path = self.output_dir / f"{base_filename}.json"
         
         try:
-            with open(json_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            if self.compress:
+                # --> No indentation and the cheapest compression level: output shrinks several times
+                # --> over for about the cost of the write it saves
+                json_path = json_path.with_suffix('.json.gz')
+                if orjson is not None:
+                    payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS, default=str)
+                else:
+                    payload = json.dumps(data, default=str).encode()
+                with gzip.open(json_path, 'wb', compresslevel=1) as f:
+                    f.write(payload)
+            # --> orjson serializes straight to bytes, much faster on large nested results
+            elif orjson is not None:
+                json_path.write_bytes(orjson.dumps(
+                    data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str
+                ))
+            else:
+                with open(json_path, 'w') as f:
+                    json.dump(data, f, indent=2, default=str)
             return json_path
         except Exception as e:
             self.logger.error(f"Failed to save JSON results: {str(e)}")
             raise
 
-    def _save_html(self, data: Dict[str, Any], base_filename: str, target: str) -> Path:
+    def _save_html(self, data: Dict[str, Any], base_filename: str, target: str, generated: str) -> Path:
         """Save results in HTML format."""
         html_path = self.output_dir / f"{base_filename}.html"
         
         try:
-            template = self.jinja_env.get_template("report_template.html")
-            
             # Prepare data for template
             template_data = {
                 'title': f"Security Scan Report - {target}",
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': generated,
                 'dns_info': self._process_dns_info(data),
                 'waf_info': self._process_waf_info(data),
                 'subdomains': self._process_subdomains(data),
                 'security_headers': self._process_security_headers(data)
             }
             
-            html_content = template.render(**template_data)
+            html_content = self.template.render(**template_data)
             html_path.write_text(html_content)
             return html_path
         except Exception as e:
@@ -303,28 +337,28 @@ class OutputManager:
     def _process_dns_info(self, data: Dict) -> list:
         """Process DNS information for template."""
         dns_info = []
-        for info in data.get('dns_info', []):
-            if info and 'records' in info:
-                records = info['records']
-                if 'a' in records:
-                    hostname, aliases, ips = records['a']
-                    dns_info.append({
-                        'hostname': hostname,
-                        'ip_addresses': ips,
-                        'aliases': aliases
-                    })
+        info = data.get('dns_info')
+        if info and 'records' in info:
+            records = info['records']
+            if records.get('a'):
+                hostname, aliases, ips = records['a']
+                dns_info.append({
+                    'hostname': hostname,
+                    'ip_addresses': ips,
+                    'aliases': aliases
+                })
         return dns_info
 
     def _process_waf_info(self, data: Dict) -> Dict:
         """Process WAF information for template."""
         waf_info = {}
-        for info in data.get('waf_info', []):
-            if info:
-                waf_info = {
-                    'waf_detected': info.get('waf_detected', False),
-                    'detected_wafs': info.get('detected_wafs', []),
-                    'recommendations': info.get('recommendations', [])
-                }
+        info = data.get('waf_info')
+        if info:
+            waf_info = {
+                'waf_detected': info.get('waf_detected', False),
+                'detected_wafs': info.get('detected_wafs', []),
+                'recommendations': info.get('recommendations', [])
+            }
         return waf_info
 
     def _process_subdomains(self, data: Dict) -> list:
@@ -334,48 +368,48 @@ class OutputManager:
     def _process_security_headers(self, data: Dict) -> Dict:
         """Process security headers for template."""
         headers_info = {'missing_headers': [], 'recommendations': []}
-        for info in data.get('security_headers', []):
-            if info and 'headers' in info:
-                headers_info['missing_headers'].extend(
-                    header for header, value in info['headers'].items()
-                    if value == 'Not Set'
-                )
-                headers_info['recommendations'].extend(
-                    info.get('recommendations', [])
-                )
+        info = data.get('security_headers')
+        if info and 'headers' in info:
+            headers_info['missing_headers'].extend(
+                header for header, value in info['headers'].items()
+                if value == 'Not Set'
+            )
+            headers_info['recommendations'].extend(
+                info.get('recommendations', [])
+            )
         return headers_info
 
-    def _save_markdown(self, data: Dict[str, Any], base_filename: str) -> Path:
+    def _save_markdown(self, data: Dict[str, Any], base_filename: str, generated: str) -> Path:
         """Save results in markdown format."""
         md_path = self.output_dir / f"{base_filename}.md"
         
         try:
             with open(md_path, 'w') as f:
-                f.write(self._generate_markdown(data))
+                f.write(self._generate_markdown(data, generated))
             return md_path
         except Exception as e:
             self.logger.error(f"Failed to save markdown results: {str(e)}")
             raise
 
-    def _save_summary(self, data: Dict[str, Any], base_filename: str) -> Path:
+    def _save_summary(self, data: Dict[str, Any], base_filename: str, generated: str) -> Path:
         """Save a brief summary of the results."""
         summary_path = self.output_dir / f"{base_filename}_summary.txt"
         
         try:
             with open(summary_path, 'w') as f:
-                f.write(self._generate_summary(data))
+                f.write(self._generate_summary(data, generated))
             return summary_path
         except Exception as e:
             self.logger.error(f"Failed to save summary: {str(e)}")
             raise
 
-    def _generate_markdown(self, data: Dict[str, Any]) -> str:
+    def _generate_markdown(self, data: Dict[str, Any], generated: str) -> str:
         """Generate markdown formatted report."""
         md = []
         
         # Header
         md.append("# Security Scan Report\n")
-        md.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        md.append(f"Generated: {generated}\n")
         
         # Process each section
         if dns_info := self._process_dns_info(data):
@@ -407,13 +441,13 @@ class OutputManager:
         
         return "\n".join(md)
 
-    def _generate_summary(self, data: Dict[str, Any]) -> str:
+    def _generate_summary(self, data: Dict[str, Any], generated: str) -> str:
         """Generate a brief summary of the results."""
         summary = []
         
         summary.append("SECURITY SCAN SUMMARY")
         summary.append("=" * 20)
-        summary.append(f"Scan Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        summary.append(f"Scan Time: {generated}\n")
         
         # Add key statistics
         if subdomains := self._process_subdomains(data):
@@ -438,16 +472,26 @@ class OutputManager:
     def get_latest_results(self, scan_type: Optional[str] = None) -> Optional[Dict]:
         """Retrieve the most recent scan results."""
         try:
-            json_files = list(self.output_dir.glob('*.json'))
-            if scan_type:
-                json_files = [f for f in json_files if scan_type in f.name]
+            # --> One directory walk; names are filtered before any stat and each entry is stat'ed once
+            with os.scandir(self.output_dir) as entries:
+                candidates = [
+                    (entry.stat().st_ctime, entry.path) for entry in entries
+                    if entry.name.endswith(('.json', '.json.gz')) and (not scan_type or scan_type in entry.name)
+                ]
             
-            if not json_files:
+            if not candidates:
                 return None
             
-            latest_file = max(json_files, key=os.path.getctime)
-            with open(latest_file) as f:
-                return json.load(f)
+            latest_file = Path(max(candidates)[1])
+            if latest_file.suffix == '.gz':
+                with gzip.open(latest_file, 'rb') as f:
+                    raw = f.read()
+            else:
+                raw = latest_file.read_bytes()
+            # --> orjson parses straight from bytes, noticeably faster on large subdomain reports
+            if orjson is not None:
+                return orjson.loads(raw)
+            return json.loads(raw)
                 
         except Exception as e:
             self.logger.error(f"Failed to retrieve latest results: {str(e)}")
@@ -1,75 +1,133 @@
 import time
 import asyncio
 import logging
+from contextlib import asynccontextmanager, contextmanager
 from threading import Lock
-from typing import Optional
+from typing import AsyncIterator, Dict, Iterator, Optional
 from .exceptions import RateLimitExceededError
 
-# Set up logging configuration
-logging.basicConfig(level=logging.INFO)
+# --> Logging is configured by the application, importing the limiter leaves the root logger alone
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+NS_PER_SECOND = 1_000_000_000
 
 class RateLimiter:
+    # --> Fixed attribute layout, the hot path reads these on every reservation
+    __slots__ = ('rate', 'burst_size', '_capacity', '_nanotokens', 'last_update', '_lock', '_last_warning')
     
     def __init__(self, requests_per_second: int = 10, burst_size: int = 20):
         self.rate = requests_per_second
         self.burst_size = burst_size
-        self.tokens = burst_size
-        self.last_update = time.monotonic()
+        # --> The bucket is kept in integer nanotokens on the monotonic_ns clock: elapsed ns * rate
+        # --> is exactly the nanotokens earned, so refills never accumulate floating-point error
+        self._capacity = burst_size * NS_PER_SECOND
+        self._nanotokens = self._capacity
+        self.last_update = time.monotonic_ns()
         self._lock = Lock()
-        self._async_lock = asyncio.Lock()
         self._last_warning = 0
+
+    @property
+    def tokens(self) -> float:
+        """Current balance in tokens, negative while callers are waiting on reservations."""
+        return self._nanotokens / NS_PER_SECOND
         
-    def _update_tokens(self) -> None:
-        """Update token bucket."""
-        now = time.monotonic()
-        time_passed = now - self.last_update
-        self.tokens = min(
-            self.burst_size,
-            self.tokens + time_passed * self.rate
-        )
+    def _refill(self, now: int) -> None:
+        """Credit the tokens earned since the last update, up to the burst capacity. Call with the lock held."""
+        nanotokens = self._nanotokens + (now - self.last_update) * self.rate
+        # --> Plain comparison instead of the builtin min(), which goes through generic call dispatch
+        self._nanotokens = nanotokens if nanotokens < self._capacity else self._capacity
         self.last_update = now
         
-    def wait(self, tokens: int = 1) -> None:
+    def _reserve(self, tokens: int) -> float:
+        """Take tokens from the bucket and return how long the caller must wait for them."""
         with self._lock:
-            self._update_tokens()
+            now = time.monotonic_ns()  # --> One clock read per call, shared by the refill and the warning throttle
+            self._refill(now)
+            # --> Take the tokens up front, the balance may go negative. The deficit is this caller's
+            # --> place in line: later callers queue up behind it without waiting on the lock.
+            # --> Nearly every call takes the default single token, skip the multiply for it
+            self._nanotokens -= NS_PER_SECOND if tokens == 1 else tokens * NS_PER_SECOND
+            if self._nanotokens >= 0:
+                return 0.0
             
-            if self.tokens < tokens:
-                # Calculate wait time
-                wait_time = (tokens - self.tokens) / self.rate
-                now = time.monotonic()
-                
-                # Warn if waiting too long
-                if now - self._last_warning > 5.0 and wait_time > 1.0:
-                    self._last_warning = now
-                    logger.warning(f"Rate limit reached, waiting {wait_time:.2f}s")
-                
-                time.sleep(wait_time)
-                self._update_tokens()
+            # Calculate wait time
+            wait_time = -self._nanotokens / self.rate / NS_PER_SECOND
             
-            self.tokens -= tokens
+            # Warn if waiting too long, at most every 5 seconds
+            warn = now - self._last_warning > 5 * NS_PER_SECOND and wait_time > 1.0
+            if warn:
+                self._last_warning = now
+        
+        if warn:
+            # --> Logged after releasing the lock, handler I/O never extends the critical section
+            logger.warning(f"Rate limit reached, waiting {wait_time:.2f}s")
+        return wait_time
+    
+    def wait(self, tokens: int = 1) -> None:
+        if wait_time := self._reserve(tokens):
+            time.sleep(wait_time)  # --> Outside the lock, other threads can reserve meanwhile
     
     async def async_wait(self, tokens: int = 1) -> None:
-        async with self._async_lock:
-            self._update_tokens()
-            
-            if self.tokens < tokens:
-                wait_time = (tokens - self.tokens) / self.rate
-                now = time.monotonic()
-                
-                if now - self._last_warning > 5.0 and wait_time > 1.0:
-                    self._last_warning = now
-                    logger.warning(f"Rate limit reached, waiting {wait_time:.2f}s")
-                
-                await asyncio.sleep(wait_time)
-                self._update_tokens()
-            
-            self.tokens -= tokens
+        # --> The lock is only held for the reservation arithmetic, never across an await, so
+        # --> coroutines don't serialize behind a sleeper and one timer wakes each at its exact slot
+        if wait_time := self._reserve(tokens):
+            await asyncio.sleep(wait_time)
+
+    @contextmanager
+    def reserve(self, tokens: int) -> Iterator[None]:
+        """Take the tokens for a whole batch of requests before issuing them."""
+        # --> One reservation covers the batch, the lock and refill run once instead of per request
+        self.wait(tokens)
+        yield
+
+    @asynccontextmanager
+    async def async_reserve(self, tokens: int) -> AsyncIterator[None]:
+        """Async counterpart of reserve()."""
+        await self.async_wait(tokens)
+        yield
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take tokens only if they are available right now, without waiting."""
+        needed = tokens * NS_PER_SECOND
+        with self._lock:
+            self._refill(time.monotonic_ns())
+            if self._nanotokens < needed:
+                return False
+            self._nanotokens -= needed
+            return True
 
     def check_rate_limit(self, tokens: int = 1) -> None:
         """Check if there are enough tokens, raise RateLimitExceededError if not."""
+        needed = tokens * NS_PER_SECOND
+        # --> A refill only ever adds tokens, so a balance that already covers the request
+        # --> is answered without taking the lock
+        if self._nanotokens >= needed:
+            return
         with self._lock:
-            self._update_tokens()
-            if self.tokens < tokens:
-                raise RateLimitExceededError(f"Rate limit exceeded, need {tokens} token(s).")
-            
+            self._refill(time.monotonic_ns())
+            if self._nanotokens < needed:
+                raise RateLimitExceededError(tokens_needed=tokens, tokens_available=self._nanotokens / NS_PER_SECOND)
+
+class KeyedRateLimiter:
+    """Independent token buckets per key, e.g. one per target host."""
+
+    def __init__(self, requests_per_second: int = 10, burst_size: int = 20):
+        self.rate = requests_per_second
+        self.burst_size = burst_size
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = Lock()  # --> Only taken the first time a key is seen
+
+    def get(self, key: str) -> RateLimiter:
+        """Return the bucket for a key, creating it on first use."""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(key, RateLimiter(self.rate, self.burst_size))
+        return limiter
+
+    def wait(self, key: str, tokens: int = 1) -> None:
+        self.get(key).wait(tokens)
+
+    async def async_wait(self, key: str, tokens: int = 1) -> None:
+        await self.get(key).async_wait(tokens)